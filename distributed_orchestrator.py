@@ -1,6 +1,8 @@
 import asyncio
 import json
+import threading
 import uuid
+from collections import deque
 from typing import Callable, Awaitable, List, Dict, Any
 
 try:
@@ -15,17 +17,36 @@ try:
 except ImportError:
     ray = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+
+def _loads(data: bytes | memoryview) -> Any:
+    return orjson.loads(data) if orjson else json.loads(bytes(data))
+
+def _write_report(path: str, metrics: List[Dict[str, Any]]) -> None:
+    if orjson:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(metrics, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w") as f:
+            json.dump(metrics, f, indent=2)
+
 class MockFirecrackerManager:
     """Simulates the lifecycle management of Firecracker microVMs."""
     def __init__(self, num_vms: int = 4):
-        self._pool = [f"192.168.1.{100 + i}" for i in range(num_vms)]
+        self._pool = deque(f"192.168.1.{100 + i}" for i in range(num_vms))
         self._vms: Dict[str, Dict[str, Any]] = {}
 
     def provision_vm(self) -> Dict[str, Any] | None:
         if not self._pool:
             print("[Warning] No available microVMs in pool.")
             return None
-        vm_id, ip = str(uuid.uuid4())[:8], self._pool.pop(0)
+        vm_id, ip = str(uuid.uuid4())[:8], self._pool.popleft()
         vm_info = {"id": vm_id, "ip": ip, "state": "running"}
         self._vms[vm_id] = vm_info
         print(f"[Firecracker] Provisioned microVM {vm_id} at {ip}")
@@ -51,16 +72,29 @@ if ray:
         def __init__(self, report_file: str):
             self.metrics = []
             self.report_file = report_file
+            self._fh = open(report_file + ".jsonl", "w", buffering=1)
+            # The actor is created with max_concurrency > 1, so calls may run
+            # on several threads at once.
+            self._lock = threading.Lock()
         def add_metric(self, metric: Dict[str, Any]):
-            self.metrics.append(metric)
-            with open(self.report_file, "w") as f:
-                json.dump(self.metrics, f, indent=2)
+            line = _dumps(metric).decode() + "\n"
+            with self._lock:
+                self.metrics.append(metric)
+                self._fh.write(line)
         def get_metrics(self) -> List[Dict[str, Any]]:
             return self.metrics
+        def finalize(self) -> List[Dict[str, Any]]:
+            """Closes the JSONL log and writes the full report once."""
+            self._fh.close()
+            _write_report(self.report_file, self.metrics)
+            return self.metrics
 
 class DistributedOrchestrator:
     """Orchestrator for agent metrics with real-time publishing."""
     PUB_ENDPOINT = "tcp://127.0.0.1:5556"
+    BATCH_SIZE = 64
+    # Sent after the last batch so the listener stops once every metric is in.
+    _END_OF_STREAM = b""
 
     def __init__(self, backend: str = 'zmq', report_file: str = "orchestrator_report.json") -> None:
         if backend not in ['zmq', 'ray']: raise ValueError("Backend must be 'zmq' or 'ray'")
@@ -72,41 +106,118 @@ class DistributedOrchestrator:
         self.metrics: List[Dict[str, Any]] = []
         self.firecracker_manager = MockFirecrackerManager()
 
-        self._ctx = zasyncio.Context.instance()
-        self.pub_socket = self._ctx.socket(zmq.PUB)
-        self.pub_socket.bind(self.PUB_ENDPOINT)
+        self._ctx = zasyncio.Context.instance() if zasyncio else None
+        # The publish socket is only bound on request, see enable_pub().
+        self.pub_socket = None
+        self._subscribers = 0
 
         if self.backend == 'ray':
             if not ray.is_initialized(): ray.init(ignore_reinit_error=True, log_to_driver=False)
-            self.metric_collector = MetricCollector.remote(self.report_file)
+            self.metric_collector = MetricCollector.options(max_concurrency=1000).remote(self.report_file)
+            self._remote_agents: Dict[Callable, Any] = {}
         else: # ZMQ
             self._pull = self._ctx.socket(zmq.PULL)
-            self.endpoint = "inproc://orchestrator"
+            self.endpoint = f"inproc://orchestrator-{uuid.uuid4().hex[:8]}"
             self._pull.bind(self.endpoint)
+            # A single long-lived PUSH socket; creating one per metric pays the
+            # connect/close handshake on every send.
+            self._push = self._ctx.socket(zmq.PUSH)
+            self._push.setsockopt(zmq.SNDHWM, 100000)
+            self._push.setsockopt(zmq.LINGER, 0)
+            self._push.connect(self.endpoint)
+            # Metrics are queued here and coalesced into multipart sends.
+            self._outbox: asyncio.Queue = asyncio.Queue()
+
+    def enable_pub(self, endpoint: str | None = None) -> str:
+        """Binds the real-time metric publisher and returns its endpoint.
+
+        Without an ``endpoint`` a free local port is picked; pass
+        ``PUB_ENDPOINT`` for the fixed address the mock GUI client expects.
+        Must be called before :meth:`run`.
+        """
+        if not zasyncio: raise ImportError("Publishing metrics requires pyzmq.")
+        if self.pub_socket is None:
+            # XPUB surfaces subscription frames so publishing can be skipped
+            # entirely while no monitoring client is attached. VERBOSER passes
+            # every unsubscribe, not just a topic's last one, so the
+            # subscriber count drops back to zero when all clients leave.
+            self.pub_socket = self._ctx.socket(zmq.XPUB)
+            self.pub_socket.setsockopt(zmq.XPUB_VERBOSER, 1)
+            self.pub_socket.bind(endpoint or "tcp://127.0.0.1:*")
+        return self.pub_socket.getsockopt(zmq.LAST_ENDPOINT).decode()
+
+    @property
+    def _has_subs(self) -> bool:
+        return self._subscribers > 0
+
+    async def _watch_subscriptions(self) -> None:
+        """Tracks the number of subscribers from XPUB (un)subscribe frames."""
+        while True:
+            frame = await self.pub_socket.recv()
+            if frame[:1] == b"\x01":
+                self._subscribers += 1
+            elif frame[:1] == b"\x00":
+                self._subscribers = max(0, self._subscribers - 1)
 
     async def send_metric(self, metric: Dict[str, Any]) -> None:
-        await self.pub_socket.send_json(metric)
+        payload = _dumps(metric)
+        if self._has_subs:
+            await self.pub_socket.send(payload)
         if self.backend == 'ray':
             await self.metric_collector.add_metric.remote(metric)
         else:
-            push = self._ctx.socket(zmq.PUSH)
-            push.connect(self.endpoint)
-            await push.send_json(metric)
-            push.close()
+            await self._outbox.put(payload)
+
+    async def _flusher(self) -> None:
+        """Drains the outbox and sends up to ``BATCH_SIZE`` encoded metrics per multipart message."""
+        while True:
+            batch = [await self._outbox.get()]
+            while len(batch) < self.BATCH_SIZE and not self._outbox.empty():
+                batch.append(self._outbox.get_nowait())
+            try:
+                await self._push.send_multipart(batch)
+            except zmq.ZMQError as e:
+                # Keep draining: run() waits on the outbox, so a dead flusher
+                # would hang shutdown. The batch is lost either way.
+                print(f"[Warning] Dropped {len(batch)} metrics: {e}")
+            finally:
+                for _ in batch:
+                    self._outbox.task_done()
 
     async def _listener(self) -> None:
         if self.backend == 'zmq':
             while True:
                 try:
-                    data = await self._pull.recv_json()
-                    self.metrics.append(data)
-                    with open(self.report_file, "w") as f:
-                        json.dump(self.metrics, f, indent=2)
+                    # copy=False hands back zmq.Frame objects whose buffer is
+                    # a memoryview over ZMQ's own message memory.
+                    frames = await self._pull.recv_multipart(copy=False)
+                    if len(frames) == 1 and not len(frames[0]): break  # _END_OF_STREAM
+                    for frame in frames:
+                        self.metrics.append(_loads(frame.buffer))
+                        self._fh.write(frame.buffer)
+                        self._fh.write(b"\n")
                 except asyncio.CancelledError:
                     break
 
-    async def run(self, agents: List[Callable[["DistributedOrchestrator"], Awaitable[None]]]) -> List[Dict[str, Any]]:
+    def _remote_agent(self, agent: Callable) -> Callable:
+        """Returns the Ray remote launcher for ``agent``, decorating it only once."""
+        if agent not in self._remote_agents:
+            self._remote_agents[agent] = ray.remote(num_cpus=0)(agent).remote
+        return self._remote_agents[agent]
+
+    async def run(self, agents: List[Callable[["DistributedOrchestrator"], Awaitable[None]]], timeout: float | None = None) -> List[Dict[str, Any]]:
+        """Runs every agent in its own microVM and returns the collected metrics.
+
+        Agents still running after ``timeout`` seconds are cancelled; metrics
+        they sent before that are kept.
+        """
+        if self.backend == 'zmq':
+            # Metrics are appended to a JSONL log as they arrive; the pretty
+            # report is written once at shutdown.
+            self._fh = open(self.report_file + ".jsonl", "wb")
         listener_task = asyncio.create_task(self._listener()) if self.backend == 'zmq' else None
+        flusher_task = asyncio.create_task(self._flusher()) if self.backend == 'zmq' else None
+        watcher_task = asyncio.create_task(self._watch_subscriptions()) if self.pub_socket is not None else None
 
         async def run_agent_in_vm(agent_func):
             vm_info = self.firecracker_manager.provision_vm()
@@ -116,18 +227,43 @@ class DistributedOrchestrator:
             finally:
                 self.firecracker_manager.deprovision_vm(vm_info['id'])
 
-        agent_tasks = [ray.remote(agent).remote for agent in agents] if self.backend == 'ray' else agents
-        await asyncio.gather(*[run_agent_in_vm(agent) for agent in agent_tasks])
+        agent_tasks = [self._remote_agent(agent) for agent in agents] if self.backend == 'ray' else agents
+        tasks = [asyncio.create_task(run_agent_in_vm(agent)) for agent in agent_tasks]
+        done = set()
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                print("[Warning] Agent timed out and was cancelled.")
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
-        if listener_task:
-            await asyncio.sleep(0.1)
-            listener_task.cancel()
-            try: await listener_task
+        if flusher_task:
+            await self._outbox.join()
+            flusher_task.cancel()
+            try: await flusher_task
             except asyncio.CancelledError: pass
 
+        if listener_task:
+            await self._push.send(self._END_OF_STREAM)
+            await listener_task
+            self._fh.close()
+            _write_report(self.report_file, self.metrics)
+
         if self.backend == 'ray':
-            self.metrics = await self.metric_collector.get_metrics.remote()
+            self.metrics = await self.metric_collector.finalize.remote()
             ray.shutdown()
 
-        self.pub_socket.close()
+        if watcher_task:
+            watcher_task.cancel()
+            try: await watcher_task
+            except asyncio.CancelledError: pass
+            self.pub_socket.close()
+        if self.backend == 'zmq':
+            self._push.close()
+            self._pull.close()
+        # Raised only after shutdown so the report and sockets are handled
+        # the same way as on success.
+        for task in tasks:
+            if task in done and not task.cancelled() and task.exception():
+                raise task.exception()
         return self.metrics
@@ -1,40 +1,54 @@
 import sys
 import asyncio
+import threading
+import time
+import qasync
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QFormLayout, QLineEdit, QSpinBox, QCheckBox,
                              QPushButton, QPlainTextEdit, QHBoxLayout)
-from PyQt6.QtCore import QObject, pyqtSignal, QThread
+from PyQt6.QtCore import QObject, pyqtSignal, QTimer
+from PyQt6.QtGui import QTextCursor
 
 # Import the core logic from our refactored main.py
 from main import run_scan_logic, display_banner
 
 class Stream(QObject):
-    """Custom stream object to redirect console output to a Qt widget."""
+    """Custom stream object to redirect console output to a Qt widget.
+
+    Writes are buffered and emitted in batches so a verbose scan does not
+    update the log widget once per print call. Worker threads (e.g. from
+    ``asyncio.to_thread``) may print too, hence the lock.
+    """
     newText = pyqtSignal(str)
+    MAX_PENDING_WRITES = 64
+    FLUSH_INTERVAL = 0.05
 
-    def write(self, text):
-        self.newText.emit(str(text))
+    def __init__(self):
+        super().__init__()
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._last_emit = time.monotonic()
 
-    def flush(self):
-        pass
+    def _drain(self) -> str:
+        text = "".join(self._buffer)
+        self._buffer.clear()
+        self._last_emit = time.monotonic()
+        return text
 
-class ScanThread(QThread):
-    """Runs the asyncio scan logic in a separate thread."""
-    def __init__(self, args_dict):
-        super().__init__()
-        self.args_dict = args_dict
+    def write(self, text):
+        with self._lock:
+            self._buffer.append(str(text))
+            if (len(self._buffer) < self.MAX_PENDING_WRITES
+                    and time.monotonic() - self._last_emit < self.FLUSH_INTERVAL):
+                return
+            text = self._drain()
+        self.newText.emit(text)
 
-    def run(self):
-        try:
-            # Each thread needs its own asyncio event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(run_scan_logic(self.args_dict))
-            loop.close()
-        except Exception as e:
-            # Emit the exception to be displayed in the GUI
-            # The custom stream will handle this
-            print(f"[bold red]An error occurred in the scan thread: {e}[/bold red]")
+    def flush(self):
+        with self._lock:
+            text = self._drain()
+        if text:
+            self.newText.emit(text)
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -90,8 +104,13 @@ class MainWindow(QMainWindow):
         sys.stdout = self.stream
         sys.stderr = self.stream
 
+        # Pushes out text that is still buffered once the scan goes quiet.
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.stream.flush)
+        self.flush_timer.start(100)
+
     def on_new_text(self, text):
-        self.log_output.moveCursor(self.log_output.textCursor().End)
+        self.log_output.moveCursor(QTextCursor.MoveOperation.End)
         self.log_output.insertPlainText(text)
 
     def start_scan(self):
@@ -112,23 +131,35 @@ class MainWindow(QMainWindow):
             "retest": None # Hardcoded for now
         }
 
-        # Run the scan in a separate thread
-        self.scan_thread = ScanThread(args)
-        self.scan_thread.finished.connect(self.scan_finished)
-        self.scan_thread.start()
+        # The scan runs on the Qt event loop via qasync, no extra thread needed
+        self.scan_task = asyncio.ensure_future(self.run_scan(args))
+
+    async def run_scan(self, args):
+        try:
+            await run_scan_logic(args)
+        except Exception as e:
+            # The custom stream will display this in the GUI
+            print(f"[bold red]An error occurred during the scan: {e}[/bold red]")
+        finally:
+            self.scan_finished()
 
     def scan_finished(self):
+        self.stream.flush()
         self.start_button.setEnabled(True)
-        print("\n--- GUI: Scan thread finished. ---")
+        print("\n--- GUI: Scan finished. ---")
 
     def closeEvent(self, event):
         # Restore stdout/stderr on close
+        self.stream.flush()
         sys.stdout = sys.__stdout__
         sys.stderr = sys.__stderr__
         super().closeEvent(event)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec())
+    with loop:
+        loop.run_forever()
@@ -4,56 +4,285 @@ SQLi Hunter - Main Entry Point.
 """
 import argparse
 import asyncio
+import functools
 import json
+import os
 import random
-from urllib.parse import urlparse
+import re
+import statistics
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable
+from urllib.parse import urlparse, parse_qs
 from playwright.async_api import async_playwright
 from playwright_stealth.stealth import Stealth
 from rich.console import Console
+from rich.live import Live
 from rich.table import Table
 import dns.asyncresolver
 import cloudscraper
+from urllib3.util.retry import Retry
 
+from sqli_hunter.context_pool import ContextPool, CONTEXT_ROTATE_PAGES
 from sqli_hunter.crawler import Crawler
 from sqli_hunter.scanner import Scanner
 from sqli_hunter.exploiter import Exploiter
 from sqli_hunter.waf_detector import WafDetector
+from sqli_hunter.utils import BloomFilter, get_async_logger
+
+try:  # Optional faster event loop
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:  # Optional faster JSON encoder/decoder
+    import orjson
+except ImportError:
+    orjson = None
+
+try:  # Optional c-ares resolver for canary lookups
+    import aiodns
+except ImportError:
+    aiodns = None
+
+# Per-target errors can come in bursts (network trouble, WAF lockouts); the
+# queued logger keeps those writes off the event loop.
+logger = get_async_logger("scan")
 
 SCANNER_WORKERS = 10
+# Chromium features the scan never needs; dropping them trims per-page memory.
+CHROMIUM_ARGS = [
+    "--no-zygote",
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-accelerated-2d-canvas",
+    "--disable-webgl",
+]
+# Stylesheets are still loaded: some bot checks look for them.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+# requests keeps at most 10 idle connections per host by default, fewer than
+# the scans plus baseline requests that can be in flight against one target.
+HTTP_POOL_CONNECTIONS = SCANNER_WORKERS * 2
+HTTP_POOL_MAXSIZE = SCANNER_WORKERS * 4
+HTTP_CONNECT_RETRIES = 2
+SCRAPER_THREADS = SCANNER_WORKERS * 2
+CANARY_DNS_CONCURRENCY = 256
+# Kept in the user cache directory so runs from a checkout leave no file behind.
+WAF_CACHE_FILE = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "sqli_hunter", "waf_cache.json")
+WAF_CACHE_TTL = 24 * 60 * 60
+_SCHEME_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9+\-.]*://')
 
 def display_banner(console: Console):
     banner = "[bold cyan]... (banner omitted for brevity) ...[/bold cyan]"
     console.print(banner)
 
-def deduplicate_vulnerabilities(vulnerabilities: list) -> list:
-    """Groups vulnerabilities by root cause (URL, parameter, type) and returns a unique list."""
-    seen_signatures = set()
-    unique_vulns = []
-    for vuln in vulnerabilities:
-        vuln_type_general = vuln['type'].split('(')[0].strip()
-        signature = (vuln['url'], vuln.get('parameter'), vuln_type_general)
-        if signature not in seen_signatures:
-            unique_vulns.append(vuln)
-            seen_signatures.add(signature)
-    return unique_vulns
-
-async def scanner_worker(queue: asyncio.Queue, scanner: Scanner, collaborator_url: str | None):
+def create_scraper() -> cloudscraper.CloudScraper:
+    """Creates the shared cloudscraper session with a connection pool sized for concurrent scans."""
+    scraper = cloudscraper.create_scraper()
+    scraper.headers['Connection'] = 'keep-alive'
+    for adapter in scraper.adapters.values():
+        # Rebuilding the pool manager keeps cloudscraper's TLS cipher setup,
+        # which its adapter injects in init_poolmanager.
+        adapter.init_poolmanager(HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE)
+        # Only failed connects are retried: replaying a request that reached
+        # the server would resend payloads and skew time-based checks, and
+        # 5xx responses are scan signal rather than transient errors.
+        adapter.max_retries = Retry(total=HTTP_CONNECT_RETRIES, connect=HTTP_CONNECT_RETRIES, read=0, status=0, redirect=False, backoff_factor=0.2)
+    return scraper
+
+async def _block_heavy_resources(route):
+    """Aborts requests for resources the scanner never inspects."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+def _read_json(path: str):
+    """Loads a JSON file, using orjson when it is installed."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+    # catch the same exception either way.
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _write_json(path: str, obj):
+    if orjson:
+        with open(path, 'wb') as f: f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f: json.dump(obj, f, indent=2)
+
+def _jsonl_line(obj) -> bytes:
+    if orjson:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, default=str).encode() + b"\n"
+
+def _read_jsonl(path: str) -> list:
+    with open(path, 'rb') as f:
+        return [orjson.loads(line) if orjson else json.loads(line) for line in f if line.strip()]
+
+def _load_waf_cache() -> dict:
+    # ValueError covers both json's and orjson's decode errors.
+    try: data = _read_json(WAF_CACHE_FILE)
+    except (IOError, ValueError): return {}
+    return data if isinstance(data, dict) else {}
+
+def _save_waf_cache(cache: dict):
+    try:
+        os.makedirs(os.path.dirname(WAF_CACHE_FILE), exist_ok=True)
+        _write_json(WAF_CACHE_FILE, cache)
+    except IOError: pass
+
+async def detect_waf(waf_detector: WafDetector, url: str) -> str | None:
+    """Returns the WAF for the target host, reusing a verdict cached within WAF_CACHE_TTL."""
+    host = urlparse(url).netloc
+    cache = _load_waf_cache()
+    entry = cache.get(host)
+    if isinstance(entry, dict) and time.time() - entry.get("timestamp", 0) < WAF_CACHE_TTL:
+        print(f"[*] Using cached WAF result for {host}: {entry.get('waf') or 'None'}")
+        await waf_detector.prime_session(url)
+        return entry.get("waf")
+    try:
+        waf_name = await waf_detector.check_waf(url)
+    except ConnectionError:
+        # A failed probe is not a "no WAF" verdict; scan unprotected this run
+        # but probe again next time.
+        return None
+    cache[host] = {"waf": waf_name, "timestamp": time.time()}
+    _save_waf_cache(cache)
+    return waf_name
+
+# Each target URL is parsed by target_signature() and scan_target_item();
+# memoize so that happens once per URL.
+_parsed_url = functools.lru_cache(maxsize=8192)(urlparse)
+
+def target_signature(target_item: dict) -> str:
+    """Keys a target by method, host, path and parameter names, ignoring parameter values."""
+    parsed = _parsed_url(target_item.get("url", ""))
+    if target_item.get("type") == "form":
+        names = [i.get("name") or "" for i in target_item.get("inputs", [])]
+    else:
+        names = parse_qs(parsed.query, keep_blank_values=True)
+    params = ",".join(sorted(names))
+    return f"{target_item.get('type')}:{target_item.get('method', 'GET').upper()} {parsed.netloc}{parsed.path}?{params}"
+
+def create_canary_lookup() -> Callable[[str], Awaitable]:
+    """Returns an A-record lookup coroutine function, backed by aiodns when it is installed."""
+    if aiodns:
+        resolver = aiodns.DNSResolver(timeout=2, tries=2)
+        # aiodns 4 deprecates query() in favour of query_dns().
+        query = getattr(resolver, "query_dns", None) or resolver.query
+        return lambda domain: query(domain, 'A')
+    resolver = dns.asyncresolver.Resolver()
+    return lambda domain: resolver.resolve(domain, 'A')
+
+def is_dns_miss(error: BaseException) -> bool:
+    """True when a lookup failed only because the name has no A record, i.e. the canary never fired."""
+    if isinstance(error, (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)):
+        return True
+    return bool(aiodns) and isinstance(error, aiodns.error.DNSError) and \
+        error.args[:1] in ((aiodns.error.ARES_ENOTFOUND,), (aiodns.error.ARES_ENODATA,))
+
+async def resolve_canaries(lookup: Callable[[str], Awaitable], canary_store: dict, collaborator: str) -> list:
+    """Resolves all canary domains concurrently with ``lookup``.
+
+    Returns ``(canary_id, sink_info, answer_or_exception)`` tuples in
+    ``canary_store`` order.
+    """
+    semaphore = asyncio.Semaphore(CANARY_DNS_CONCURRENCY)
+    async def resolve(domain: str):
+        async with semaphore:
+            return await lookup(domain)
+    canaries = list(canary_store.items())
+    suffix = f".stored.{collaborator}"
+    domains = [canary_id + suffix for canary_id, _ in canaries]
+    results = await asyncio.gather(*map(resolve, domains), return_exceptions=True)
+    return [(canary_id, sink_info, result) for (canary_id, sink_info), result in zip(canaries, results)]
+
+def build_results_table() -> Table:
+    table = Table(title="SQLi Hunter Scan Results (De-duplicated)")
+    table.add_column("URL", style="cyan", no_wrap=True); table.add_column("Parameter", style="magenta")
+    table.add_column("Type", style="green"); table.add_column("Example Payload", style="red")
+    return table
+
+class HostCircuitBreaker:
+    """Adapts per-target scan timeouts to each host and stops scanning hosts that keep stalling.
+
+    The timeout is four times the host's median scan time, clamped to
+    [MIN_TIMEOUT, MAX_TIMEOUT]. Every timeout opens the breaker for the host
+    for an exponentially growing window, during which its targets are skipped.
+    """
+    MIN_TIMEOUT = 60.0
+    MAX_TIMEOUT = 600.0
+    MIN_SAMPLES = 5
+    # Targets finishing faster than this had nothing to fuzz (e.g. no
+    # parameters) and would drag the median down.
+    MIN_RECORDED_DURATION = 1.0
+    BASE_OPEN_WINDOW = 30.0
+    MAX_OPEN_WINDOW = 300.0
+
+    def __init__(self):
+        self._durations: dict[str, deque] = {}
+        self._failures: dict[str, int] = {}
+        self._open_until: dict[str, float] = {}
+
+    def is_open(self, host: str) -> bool:
+        return self._open_until.get(host, 0.0) > time.monotonic()
+
+    def timeout(self, host: str) -> float:
+        durations = self._durations.get(host)
+        if not durations or len(durations) < self.MIN_SAMPLES:
+            return self.MAX_TIMEOUT
+        return min(self.MAX_TIMEOUT, max(self.MIN_TIMEOUT, 4 * statistics.median(durations)))
+
+    def record_success(self, host: str, duration: float):
+        self._failures[host] = 0
+        if duration >= self.MIN_RECORDED_DURATION:
+            self._durations.setdefault(host, deque(maxlen=50)).append(duration)
+
+    def record_timeout(self, host: str):
+        failures = self._failures.get(host, 0) + 1
+        self._failures[host] = failures
+        window = min(self.MAX_OPEN_WINDOW, self.BASE_OPEN_WINDOW * 2 ** (failures - 1))
+        self._open_until[host] = time.monotonic() + window
+
+async def scan_target_item(target_item: dict, scanner: Scanner, collaborator_url: str | None, breaker: HostCircuitBreaker):
+    url = target_item.get("url", "Unknown Target")
+    host = _parsed_url(url).netloc
+    if breaker.is_open(host):
+        logger.warning("[!] Skipping %s: too many timeouts on %s recently.", url, host)
+        return
+    timeout = breaker.timeout(host)
+    start_time = time.monotonic()
+    try:
+        await asyncio.wait_for(
+            scanner.scan_target(target_item, collaborator_url),
+            timeout=timeout
+        )
+        breaker.record_success(host, time.monotonic() - start_time)
+    except asyncio.TimeoutError:
+        breaker.record_timeout(host)
+        logger.warning("[!] Target timed out after %.0fs and was skipped: %s", timeout, url)
+    except Exception as e:
+        logger.warning("[!] An unexpected error occurred while scanning %s: %s", url, e)
+
+async def dispatch_targets(queue: asyncio.Queue, scanner: Scanner, collaborator_url: str | None):
+    """Starts a scan task per distinct queued target, at most SCANNER_WORKERS at a time, until a None sentinel."""
+    semaphore = asyncio.Semaphore(SCANNER_WORKERS)
+    in_flight = set()
+    # Targets that differ only in parameter values hit the same code path.
+    seen_targets = BloomFilter(capacity=10_000, error_rate=0.001)
+    breaker = HostCircuitBreaker()
     while True:
         target_item = await queue.get()
         if target_item is None: break
-        try:
-            await asyncio.wait_for(
-                scanner.scan_target(target_item, collaborator_url),
-                timeout=600.0
-            )
-        except asyncio.TimeoutError:
-            url = target_item.get("url", "Unknown Target")
-            print(f"[!] Target timed out and was skipped: {url}")
-        except Exception as e:
-            url = target_item.get("url", "Unknown Target")
-            print(f"[!] An unexpected error occurred while scanning {url}: {e}")
-        finally:
-            queue.task_done()
+        if not seen_targets.add(target_signature(target_item)): continue
+        await semaphore.acquire()
+        task = asyncio.create_task(scan_target_item(target_item, scanner, collaborator_url, breaker))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+        task.add_done_callback(lambda _: semaphore.release())
+    await asyncio.gather(*in_flight)
 
 async def run_scan_logic(args: dict, console: Console | None = None):
     """The core logic of the scanner, refactored to be callable from other modules."""
@@ -65,14 +294,27 @@ async def run_scan_logic(args: dict, console: Console | None = None):
         console.print("[red]URL is a required argument.[/red]")
         return
 
-    if not urlparse(url).scheme:
+    if not _SCHEME_RE.match(url):
         url = "http://" + url
 
     console.print(f"[bold green][*] Target URL:[/] [link={url}]{url}[/link]")
 
+    # requests is blocking, so every scraper call goes through
+    # asyncio.to_thread. Size the pool so each worker can have a request in
+    # flight alongside the WAF probes instead of queueing on the small default.
+    # asyncio.run() shuts it down; a GUI loop drops it when the next scan
+    # installs its own, and idle workers of a collected pool exit.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=SCRAPER_THREADS, thread_name_prefix="scraper")
+    )
+
     async with Stealth().use_async(async_playwright()) as p:
-        browser = await p.chromium.launch()
-        context = await browser.new_context(
+        browser = await p.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+        # Pages come from a pool that swaps in a fresh context every few
+        # dozen pages so Chromium's per-context memory stays bounded.
+        context = await ContextPool(
+            browser,
+            rotate_after=args.get("context_rotate") or CONTEXT_ROTATE_PAGES,
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36",
             viewport={
                 'width': 1280 + random.randint(0, 100),
@@ -80,7 +322,8 @@ async def run_scan_logic(args: dict, console: Console | None = None):
             },
             locale='en-US',
             timezone_id='America/New_York'
-        )
+        ).start()
+        await context.route("**/*", _block_heavy_resources)
         if args.get("cookie"):
             try:
                 name, value = args["cookie"].split('=', 1)
@@ -90,9 +333,9 @@ async def run_scan_logic(args: dict, console: Console | None = None):
                 console.print("[red][!] Invalid cookie format. Please use 'name=value'.[/red]")
 
         queue = asyncio.Queue()
-        scraper = cloudscraper.create_scraper()
+        scraper = create_scraper()
         waf_detector = WafDetector(context, scraper)
-        waf_name = await waf_detector.check_waf(url)
+        waf_name = await detect_waf(waf_detector, url)
 
         canary_store = {}
         scanner = Scanner(
@@ -104,56 +347,73 @@ async def run_scan_logic(args: dict, console: Console | None = None):
             debug=args.get("debug", False),
             adv_tamper=args.get("adv_tamper", False)
         )
-        scanner_tasks = [asyncio.create_task(scanner_worker(queue, scanner, args.get("collaborator"))) for _ in range(SCANNER_WORKERS)]
+        # Rows are added as findings come in. On a real TTY the table is
+        # rendered live; redirected consoles (e.g. the GUI's force_terminal
+        # stream) get it printed once at the end instead.
+        results_table = build_results_table()
+        def add_result_row(vuln: dict):
+            results_table.add_row(vuln['url'], vuln.get('parameter', 'N/A'), vuln['type'], str(vuln['payload']))
+        # With --json-report, findings are appended to a JSONL log as they
+        # are found, so a crashed or interrupted scan still leaves a record.
+        report_log_path = args["json_report"] + ".jsonl" if args.get("json_report") else None
+        report_log = open(report_log_path, 'wb') if report_log_path else None
+        def on_vulnerability(vuln: dict):
+            add_result_row(vuln)
+            if report_log:
+                report_log.write(_jsonl_line(vuln))
+                report_log.flush()
+        scanner.on_vulnerability = on_vulnerability
+        is_tty = getattr(console.file, "isatty", lambda: False)()
+        live = Live(results_table, console=console, refresh_per_second=4) if is_tty else None
+        if live: live.start()
 
-        if args.get("retest"):
-            console.print(f"\n[bold cyan]--- Running in Re-test Mode using {args['retest']} ---[/bold cyan]")
-            try:
-                with open(args['retest'], 'r') as f:
-                    previous_vulns = json.load(f)
-                urls_to_test = {vuln['url'] for vuln in previous_vulns}
-                for u in urls_to_test:
-                    await queue.put({"type": "url", "url": u, "method": "GET"})
-                console.print(f"[*] Queued {len(urls_to_test)} unique URLs for re-testing.")
-            except (IOError, json.JSONDecodeError) as e:
-                console.print(f"[bold red][!] Error reading re-test file: {e}[/bold red]")
-                return
-        elif args.get("no_crawl"):
-            console.print("[yellow][!] Crawler disabled. Scanning only the provided URL.[/yellow]")
-            await queue.put({"type": "url", "url": url, "method": "GET"})
-        else:
-            console.print("\n[bold cyan]--- Starting Concurrent Crawl & Scan ---[/bold cyan]")
-            crawler = Crawler(base_url=url, max_depth=args.get("depth", 3), queue=queue, browser_context=context)
-            await crawler.start()
-
-        await queue.join()
-        for _ in range(SCANNER_WORKERS): await queue.put(None)
-        await asyncio.gather(*scanner_tasks)
-
-        if canary_store and args.get("collaborator"):
-            console.print("\n[bold cyan]--- Verifying Stored SQLi Canaries ---[/bold cyan]")
-            resolver = dns.asyncresolver.Resolver()
-            for canary_id, sink_info in canary_store.items():
-                domain_to_check = f"{canary_id}.stored.{args['collaborator']}"
+        try:
+            dispatcher = asyncio.create_task(dispatch_targets(queue, scanner, args.get("collaborator")))
+
+            if args.get("retest"):
+                console.print(f"\n[bold cyan]--- Running in Re-test Mode using {args['retest']} ---[/bold cyan]")
                 try:
-                    await resolver.resolve(domain_to_check, 'A')
+                    previous_vulns = _read_json(args['retest'])
+                    urls_to_test = {vuln['url'] for vuln in previous_vulns}
+                    for u in urls_to_test:
+                        await queue.put({"type": "url", "url": u, "method": "GET"})
+                    console.print(f"[*] Queued {len(urls_to_test)} unique URLs for re-testing.")
+                except (IOError, json.JSONDecodeError) as e:
+                    console.print(f"[bold red][!] Error reading re-test file: {e}[/bold red]")
+                    return
+            elif args.get("no_crawl"):
+                console.print("[yellow][!] Crawler disabled. Scanning only the provided URL.[/yellow]")
+                await queue.put({"type": "url", "url": url, "method": "GET"})
+            else:
+                console.print("\n[bold cyan]--- Starting Concurrent Crawl & Scan ---[/bold cyan]")
+                crawler = Crawler(base_url=url, max_depth=args.get("depth", 3), queue=queue, browser_context=context)
+                await crawler.start()
+
+            await queue.put(None)
+            await dispatcher
+
+            if canary_store and args.get("collaborator"):
+                console.print("\n[bold cyan]--- Verifying Stored SQLi Canaries ---[/bold cyan]")
+                for canary_id, sink_info, result in await resolve_canaries(create_canary_lookup(), canary_store, args['collaborator']):
+                    if is_dns_miss(result): continue
+                    if isinstance(result, Exception):
+                        console.print(f"[yellow][!] Error checking canary {canary_id}: {result}[/yellow]")
+                        continue
                     vuln_info = {"url": sink_info['url'], "type": "Stored SQLi (via OAST)", "parameter": sink_info['param'], "payload": f"Canary {canary_id} triggered."}
-                    scanner.vulnerable_points.append(vuln_info)
+                    if not scanner.record_vulnerability(vuln_info): continue
                     console.print(f"[bold red][+] Stored SQLi Detected![/bold red] Canary from {sink_info['url']} (param: {sink_info['param']}) triggered.")
-                except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer): pass
-                except Exception as e: console.print(f"[yellow][!] Error checking canary {canary_id}: {e}[/yellow]")
+        finally:
+            if live: live.stop()
+            if report_log: report_log.close()
 
         console.print("\n[bold cyan]--- Scan Finished ---[/bold cyan]")
-        unique_vulnerabilities = deduplicate_vulnerabilities(scanner.vulnerable_points)
+        # vulnerable_points is keyed by signature, so it holds no duplicates.
+        unique_vulnerabilities = list(scanner.vulnerable_points.values())
 
         if unique_vulnerabilities:
             console.print("\n[bold red][!!!] VULNERABILITIES FOUND [!!!][/bold red]")
-            table = Table(title="SQLi Hunter Scan Results (De-duplicated)")
-            table.add_column("URL", style="cyan", no_wrap=True); table.add_column("Parameter", style="magenta")
-            table.add_column("Type", style="green"); table.add_column("Example Payload", style="red")
-            for vuln in unique_vulnerabilities:
-                table.add_row(vuln['url'], vuln.get('parameter', 'N/A'), vuln['type'], str(vuln['payload']))
-            console.print(table)
+            if not live:
+                console.print(results_table)
             if args.get("dump_db"):
                 error_based_vuln = next((v for v in unique_vulnerabilities if "Error-Based" in v['type'] and v.get('dialect') == 'mssql'), None)
                 if error_based_vuln:
@@ -164,9 +424,9 @@ async def run_scan_logic(args: dict, console: Console | None = None):
         else:
             console.print("\n[bold green][-] No vulnerabilities were found.[/bold green]")
 
-        if args.get("json_report"):
-            with open(args["json_report"], 'w') as f:
-                json.dump(unique_vulnerabilities, f, indent=4)
+        if report_log_path:
+            # The log only ever receives new signatures, so it is already de-duplicated.
+            _write_json(args["json_report"], _read_jsonl(report_log_path))
             console.print(f"[green][*] Scan report saved to {args['json_report']}[/green]")
 
         await browser.close()
@@ -186,6 +446,7 @@ def main():
     parser.add_argument("--adv-tamper", action="store_true", help="Enable advanced AST-based payload tampering (AdvSQLi).")
     parser.add_argument("--use-diffusion", action="store_true", help="Use the diffusion model to generate payload variations.")
     parser.add_argument("--use-llm-mutator", action="store_true", help="Use an LLM to mutate payloads.")
+    parser.add_argument("--context-rotate", type=int, default=CONTEXT_ROTATE_PAGES, help="Replace the browser context after this many pages to cap memory use.")
     args = parser.parse_args()
 
     if not args.url:
@@ -194,7 +455,8 @@ def main():
 
     console = Console()
     display_banner(console)
-    asyncio.run(run_scan_logic(vars(args)))
+    run = uvloop.run if uvloop else asyncio.run
+    run(run_scan_logic(vars(args)))
 
 if __name__ == "__main__":
     main()
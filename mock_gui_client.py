@@ -1,8 +1,19 @@
 import asyncio
+import sys
 import zmq
 import zmq.asyncio as zasyncio
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:  # Optional faster event loop (POSIX only)
+    import uvloop
+except ImportError:
+    uvloop = None
+
 async def main():
     """
     A mock GUI client that subscribes to the orchestrator's real-time
@@ -10,6 +21,8 @@ async def main():
     """
     ctx = zasyncio.Context.instance()
     sub_socket = ctx.socket(zmq.SUB)
+    # Bound the receive queue so a slow console cannot buffer metrics without limit.
+    sub_socket.setsockopt(zmq.RCVHWM, 10000)
 
     # Connect to the orchestrator's publishing endpoint
     pub_endpoint = "tcp://127.0.0.1:5556"
@@ -22,7 +35,11 @@ async def main():
 
     try:
         while True:
-            message = await sub_socket.recv_json()
+            # copy=False returns zmq.Frame objects; the JSON payload is the
+            # last frame and is parsed straight from ZMQ's buffer.
+            frames = await sub_socket.recv_multipart(copy=False)
+            payload = frames[-1].buffer
+            message = orjson.loads(payload) if orjson else json.loads(bytes(payload))
             print("\n[GUI] New metric received:")
             print(json.dumps(message, indent=2))
     except asyncio.CancelledError:
@@ -31,7 +48,15 @@ async def main():
         sub_socket.close()
 
 if __name__ == "__main__":
+    if uvloop:
+        run = uvloop.run
+    else:
+        if sys.platform == "win32":
+            # pyzmq's asyncio integration needs add_reader(), which the
+            # default Proactor loop on Windows lacks.
+            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+        run = asyncio.run
     try:
-        asyncio.run(main())
+        run(main())
     except KeyboardInterrupt:
         pass
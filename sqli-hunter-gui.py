@@ -1,12 +1,15 @@
 import sys
 import asyncio
 import random
+import threading
+import time
+import qasync
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QFormLayout, QLineEdit, QSpinBox, QCheckBox,
                              QPushButton, QPlainTextEdit, QHBoxLayout, QLabel,
                              QGraphicsDropShadowEffect)
-from PyQt6.QtCore import QObject, pyqtSignal, QThread, QTimer, Qt
-from PyQt6.QtGui import QPainter, QColor, QFont
+from PyQt6.QtCore import QObject, pyqtSignal, QTimer, Qt
+from PyQt6.QtGui import QPainter, QColor, QFont, QTextCursor
 from rich.console import Console
 
 # Import the core logic from our refactored main.py
@@ -100,30 +103,43 @@ class MatrixRainWidget(QWidget):
                 self.drops[i] += 1
 
 class Stream(QObject):
-    """Custom stream object to redirect console output to a Qt widget."""
+    """Custom stream object to redirect console output to a Qt widget.
+
+    Writes are buffered and emitted at most about 30 times a second, so
+    rich's many small writes per line do not each repaint the log widget.
+    Worker threads (e.g. from ``asyncio.to_thread``) may print too, hence
+    the lock.
+    """
     newText = pyqtSignal(str)
+    MAX_PENDING_WRITES = 64
+    FLUSH_INTERVAL = 0.033
 
-    def write(self, text):
-        self.newText.emit(str(text))
+    def __init__(self):
+        super().__init__()
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._last_emit = time.monotonic()
 
-    def flush(self):
-        pass
+    def _drain(self) -> str:
+        text = "".join(self._buffer)
+        self._buffer.clear()
+        self._last_emit = time.monotonic()
+        return text
 
-class ScanThread(QThread):
-    """Runs the asyncio scan logic in a separate thread."""
-    def __init__(self, args_dict, console):
-        super().__init__()
-        self.args_dict = args_dict
-        self.console = console
+    def write(self, text):
+        with self._lock:
+            self._buffer.append(str(text))
+            if (len(self._buffer) < self.MAX_PENDING_WRITES
+                    and time.monotonic() - self._last_emit < self.FLUSH_INTERVAL):
+                return
+            text = self._drain()
+        self.newText.emit(text)
 
-    def run(self):
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(run_scan_logic(self.args_dict, console=self.console))
-            loop.close()
-        except Exception as e:
-            print(f"[bold red]An error occurred in the scan thread: {e}[/bold red]")
+    def flush(self):
+        with self._lock:
+            text = self._drain()
+        if text:
+            self.newText.emit(text)
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -200,8 +216,13 @@ class MainWindow(QMainWindow):
         sys.stdout = self.stream
         sys.stderr = self.stream
 
+        # Pushes out text that is still buffered once the scan goes quiet.
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.stream.flush)
+        self.flush_timer.start(int(Stream.FLUSH_INTERVAL * 1000))
+
     def on_new_text(self, text):
-        self.log_output.moveCursor(self.log_output.textCursor().End)
+        self.log_output.moveCursor(QTextCursor.MoveOperation.End)
         self.log_output.insertPlainText(text)
 
     def start_scan(self):
@@ -223,21 +244,33 @@ class MainWindow(QMainWindow):
             "retest": None
         }
 
-        self.scan_thread = ScanThread(args, console=self.console)
-        self.scan_thread.finished.connect(self.scan_finished)
-        self.scan_thread.start()
+        # The scan runs on the Qt event loop via qasync, no extra thread needed
+        self.scan_task = asyncio.ensure_future(self.run_scan(args))
+
+    async def run_scan(self, args):
+        try:
+            await run_scan_logic(args, console=self.console)
+        except Exception as e:
+            print(f"[bold red]An error occurred during the scan: {e}[/bold red]")
+        finally:
+            self.scan_finished()
 
     def scan_finished(self):
+        self.stream.flush()
         self.start_button.setEnabled(True)
-        self.console.print("\n--- GUI: Scan thread finished. ---")
+        self.console.print("\n--- GUI: Scan finished. ---")
 
     def closeEvent(self, event):
+        self.stream.flush()
         sys.stdout = sys.__stdout__
         sys.stderr = sys.__stderr__
         super().closeEvent(event)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec())
+    with loop:
+        loop.run_forever()
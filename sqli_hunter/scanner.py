@@ -43,6 +43,48 @@ try:  # Optional ZeroMQ dependency
 except Exception:  # pragma: no cover - tests run without pyzmq
     zmq = None  # type: ignore
 
+try:  # Optional lexbor-backed HTML parser, much faster than html.parser
+    from selectolax.lexbor import LexborHTMLParser
+except Exception:  # pragma: no cover - falls back to BeautifulSoup
+    LexborHTMLParser = None  # type: ignore
+
+# Compiled once; every scanned response is checked against these.
+_QUERY_PLAN_RE = re.compile(r"(seq scan|index scan|query plan)", re.IGNORECASE)
+
+# SQL error patterns without regex syntax are plain phrases: they go into one
+# Aho-Corasick automaton (matched against the lower-cased body in a single
+# pass) and only the rest are run as regexes. Values are list positions, so
+# the earliest listed pattern still wins.
+_REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+_SQL_ERROR_AUTOMATON = ahocorasick.Automaton()
+_SQL_ERROR_REGEXES: List[Tuple[int, re.Pattern]] = []
+for _index, _pattern in enumerate(SQL_ERROR_PATTERNS):
+    if _REGEX_METACHARACTERS.isdisjoint(_pattern):
+        if _pattern.lower() not in _SQL_ERROR_AUTOMATON:
+            _SQL_ERROR_AUTOMATON.add_word(_pattern.lower(), _index)
+    else:
+        _SQL_ERROR_REGEXES.append((_index, re.compile(_pattern, re.IGNORECASE)))
+if len(_SQL_ERROR_AUTOMATON):
+    _SQL_ERROR_AUTOMATON.make_automaton()
+else:
+    _SQL_ERROR_AUTOMATON = None
+
+
+def _first_sql_error(body: str, lowered: str) -> str | None:
+    """Returns the earliest listed SQL_ERROR_PATTERNS entry found in ``body``."""
+    first = None
+    if _SQL_ERROR_AUTOMATON is not None:
+        for _, index in _SQL_ERROR_AUTOMATON.iter(lowered):
+            if first is None or index < first:
+                first = index
+    for index, regex in _SQL_ERROR_REGEXES:
+        if first is not None and index > first:
+            break
+        if regex.search(body):
+            first = index
+            break
+    return None if first is None else SQL_ERROR_PATTERNS[first]
+
 
 class TransformerQueryAnalyzer:
     """Lightweight semantic scorer.
@@ -271,6 +313,7 @@ class DistributedScanner:
             self._zasyncio = None
             self._ctx = None
             self._queue = asyncio.Queue()
+        self._push = None
 
     async def worker(self, handler: Callable[[dict], Awaitable[None]]) -> None:
         if self._zasyncio:
@@ -286,12 +329,18 @@ class DistributedScanner:
 
     async def submit(self, task: dict) -> None:
         if self._zasyncio:
-            sock = self._ctx.socket(zmq.PUSH)
-            sock.connect(self.endpoint)
-            await sock.send_json(task)
+            if self._push is None:
+                self._push = self._ctx.socket(zmq.PUSH)
+                self._push.connect(self.endpoint)
+            await self._push.send_json(task)
         else:
             await self._queue.put(task)
 
+def vulnerability_signature(vuln: dict) -> tuple:
+    """The root cause of a finding: URL, parameter and general vulnerability type."""
+    vuln_type_general = vuln['type'].split('(', 1)[0].rstrip()
+    return (vuln['url'], vuln.get('parameter'), vuln_type_general)
+
 WAF_TEMPO_MAP = { "Cloudflare": 1.5, "AWS WAF": 0.5, "Imperva (Incapsula)": 1.0 }
 MAX_BACKOFF_DELAY = 60.0
 ANOMALY_CONFIRMATION_THRESHOLD = 0.8 # Score needed to trigger secondary analysis
@@ -308,7 +357,10 @@ class Scanner:
         self.scraper = scraper
         self.debug = debug
         self.console = Console()
-        self.vulnerable_points = []
+        # Findings keyed by vulnerability_signature(), so duplicates are dropped on insertion.
+        self.vulnerable_points: Dict[tuple, dict] = {}
+        # Optional callback invoked with each newly reported vulnerability.
+        self.on_vulnerability: Callable[[dict], None] | None = None
         self.lock = asyncio.Lock()
         self.dns_resolver = dns.asyncresolver.Resolver()
         self.canary_store = canary_store
@@ -429,6 +481,7 @@ class Scanner:
             return 0.0, None
         if response_status != baseline_status:
             other_score += 0.5 if response_status >= 400 else 0.2
+        lowered_body = response_body.lower()
         hash_distance = baseline_hash.distance(Simhash(response_body))
         simhash_score = min(hash_distance / 64.0, 1.0)
 
@@ -447,14 +500,14 @@ class Scanner:
                 print(f"    [bold yellow]Debug: eBPF metrics: (jitter: {ebpf_metrics[0]:.6f}, syscalls: {ebpf_metrics[1]}). VAE score: {vae_score:.2f}")
 
         # Query-plan side-channel: look for tell-tale plan keywords
-        plan_hit = re.search(r"(seq scan|index scan|query plan)", response_body, re.IGNORECASE)
+        plan_hit = _QUERY_PLAN_RE.search(response_body)
         if plan_hit:
             other_score += 0.2
 
         # Aho-Corasick attack signature detection
         if self.signature_automaton:
             found_patterns: Set[str] = set()
-            for _, (pattern, weight) in self.signature_automaton.iter(response_body.lower()):
+            for _, (pattern, weight) in self.signature_automaton.iter(lowered_body):
                 if pattern not in found_patterns:
                     regex_score += weight
                     found_patterns.add(pattern)
@@ -462,20 +515,19 @@ class Scanner:
                 print(f"    [bold yellow]Debug: Signature matches:[/] {', '.join(found_patterns)}")
 
         # Check for classic SQL error patterns and infer dialect
-        for pattern in SQL_ERROR_PATTERNS:
-            if re.search(pattern, response_body, re.IGNORECASE):
-                if self.debug:
-                    print(f"    [bold yellow]Debug: Found error pattern:[/] {pattern}")
-                regex_score += 0.9
-                if "mysql" in pattern:
-                    inferred_dialect = "mysql"
-                elif "ora-" in pattern:
-                    inferred_dialect = "oracle"
-                elif "postgresql" in pattern:
-                    inferred_dialect = "postgresql"
-                elif "sqlsrv" in pattern:
-                    inferred_dialect = "mssql"
-                break
+        pattern = _first_sql_error(response_body, lowered_body)
+        if pattern:
+            if self.debug:
+                print(f"    [bold yellow]Debug: Found error pattern:[/] {pattern}")
+            regex_score += 0.9
+            if "mysql" in pattern:
+                inferred_dialect = "mysql"
+            elif "ora-" in pattern:
+                inferred_dialect = "oracle"
+            elif "postgresql" in pattern:
+                inferred_dialect = "postgresql"
+            elif "sqlsrv" in pattern:
+                inferred_dialect = "mssql"
 
         # AST extraction and ML scoring from response
         for fragment in self._extract_sql_fragments(response_body):
@@ -661,6 +713,14 @@ class Scanner:
         args = await create_request_args(taint)
         body, _, _, _ = await self._send_headless_request(url, method, **args)
         if not body or taint not in body: return "HTML_TEXT"
+        if LexborHTMLParser:
+            tree = LexborHTMLParser(body)
+            # text() covers script contents too, like BeautifulSoup's text search.
+            if tree.root is not None and taint in tree.root.text(deep=True): return "HTML_TEXT"
+            for node in tree.css("[value], [href]"):
+                attrs = node.attributes
+                if taint in (attrs.get("value") or "") or taint in (attrs.get("href") or ""): return "HTML_ATTRIBUTE"
+            return "HTML_TEXT"
         soup = BeautifulSoup(body, 'html.parser')
         if soup.find(text=re.compile(taint)): return "HTML_TEXT"
         if soup.find(attrs={'value': re.compile(taint)}) or soup.find(attrs={'href': re.compile(taint)}): return "HTML_ATTRIBUTE"
@@ -757,9 +817,16 @@ class Scanner:
             "baseline_time": baseline_time
         }
         async with self.lock:
-            if not any(v['url'] == url and v['parameter'] == param for v in self.vulnerable_points):
+            if self.record_vulnerability(vuln_info):
                 self.console.print(Panel(json.dumps(vuln_info, indent=2), title="[bold red]Vulnerability Found!", expand=False))
-                self.vulnerable_points.append(vuln_info)
+
+    def record_vulnerability(self, vuln_info: dict) -> bool:
+        """Stores a finding unless one with the same signature exists; returns True if it was new."""
+        if self.vulnerable_points.setdefault(vulnerability_signature(vuln_info), vuln_info) is not vuln_info:
+            return False
+        if self.on_vulnerability:
+            self.on_vulnerability(vuln_info)
+        return True
 
     async def distributed_scan(self, targets: List[dict]) -> List[Any]:
         """Coordinate distributed scanning using asyncio and optional ZeroMQ.
@@ -6,7 +6,12 @@ This module will contain various helper functions that are used across
 the application, such as custom logging, user-agent generation,
 and other common utilities to keep the main code clean.
 """
+import atexit
+import hashlib
 import logging
+import logging.handlers
+import math
+import queue
 import sys
 
 def get_logger(name: str) -> logging.Logger:
@@ -34,3 +39,94 @@ def get_logger(name: str) -> logging.Logger:
     logger.propagate = False
 
     return logger
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Writes to whatever ``sys.stdout`` is at emit time, so GUI redirection applies."""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def get_async_logger(name: str) -> logging.Logger:
+    """Creates a logger whose records are written to stdout by a background thread.
+
+    Logging calls only enqueue the record, so coroutines on the event loop
+    never block on a slow stdout (e.g. the GUI's redirected stream).
+    """
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        log_queue = queue.SimpleQueue()
+        handler = _StdoutHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        listener = logging.handlers.QueueListener(log_queue, handler)
+        listener.start()
+        atexit.register(listener.stop)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+class BloomFilter:
+    """A scalable Bloom filter for cheap membership checks on large key sets.
+
+    Lookups may return false positives at roughly ``error_rate`` but never
+    false negatives. When the current slice reaches its capacity a new slice
+    with twice the capacity and half the error rate is added, so the overall
+    false-positive rate stays bounded as the set grows.
+    """
+
+    def __init__(self, capacity: int = 10_000, error_rate: float = 0.001):
+        self._slices: list[tuple[bytearray, int, int, int]] = []
+        self._count = 0
+        # Slice error rates form a halving series, so starting at half the
+        # target keeps the combined rate under ``error_rate``.
+        self._add_slice(capacity, error_rate / 2)
+
+    def _add_slice(self, capacity: int, error_rate: float) -> None:
+        num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        self._slices.append((bytearray((num_bits + 7) // 8), num_bits, num_hashes, capacity))
+        self._slice_count = 0
+        self._error_rate = error_rate
+
+    @staticmethod
+    def _hashes(key: str) -> tuple[int, int]:
+        digest = hashlib.blake2b(key.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+    def __contains__(self, key: str) -> bool:
+        h1, h2 = self._hashes(key)
+        for bits, num_bits, num_hashes, _ in self._slices:
+            for i in range(num_hashes):
+                pos = (h1 + i * h2) % num_bits
+                if not bits[pos >> 3] & (1 << (pos & 7)):
+                    break
+            else:
+                return True
+        return False
+
+    def add(self, key: str) -> bool:
+        """Adds ``key`` and returns True if it was not (probably) present before."""
+        if key in self:
+            return False
+        bits, num_bits, num_hashes, capacity = self._slices[-1]
+        if self._slice_count >= capacity:
+            self._add_slice(capacity * 2, self._error_rate / 2)
+            bits, num_bits, num_hashes, capacity = self._slices[-1]
+        h1, h2 = self._hashes(key)
+        for i in range(num_hashes):
+            pos = (h1 + i * h2) % num_bits
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self._slice_count += 1
+        self._count += 1
+        return True
+
+    def __len__(self) -> int:
+        return self._count
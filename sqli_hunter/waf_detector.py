@@ -59,33 +59,54 @@ class GradientBoostClassifier:
     proper model when running in a full environment.
     """
 
+    def __init__(self):
+        # Compiled form of the last signature DB seen by predict().
+        self._source: dict | None = None
+        self._compiled: list[tuple] = []
+
+    @staticmethod
+    def _compile(signatures: dict) -> list[tuple]:
+        """Lowercases header and H2 setting names and compiles every regex once per signature DB."""
+        compiled = []
+        for waf_name, sig in signatures.items():
+            compiled.append((
+                waf_name,
+                [(header.lower(), re.compile(pattern, re.IGNORECASE)) for header, pattern in sig.get("headers", {}).items()],
+                list(sig.get("cookies", [])),
+                [re.compile(pattern, re.IGNORECASE) for pattern in sig.get("body", [])],
+                sig.get("ja3"),
+                sig.get("delay_threshold"),
+                [(name.lower(), value) for name, value in sig.get("h2_settings", {}).items()],
+            ))
+        return compiled
+
     def predict(self, features: dict, signatures: dict) -> str | None:
+        if signatures is not self._source:
+            self._compiled, self._source = self._compile(signatures), signatures
+
+        headers, cookies, body = features["headers"], features["cookies"], features["body"]
+        h2_features = features.get("h2_features", {})
         best_name, best_score = None, 0.0
-        for waf_name, sig in signatures.items():
+        for waf_name, header_sigs, cookie_sigs, body_sigs, ja3_sig, delay_threshold, h2_sigs in self._compiled:
             score = 0.0
-            for header, pattern in sig.get("headers", {}).items():
-                if header.lower() in features["headers"] and re.search(
-                    pattern, features["headers"][header.lower()], re.IGNORECASE
-                ):
+            for header, regex in header_sigs:
+                if header in headers and regex.search(headers[header]):
                     score += 1.0
-            for cookie in sig.get("cookies", []):
-                if any(c.startswith(cookie) for c in features["cookies"]):
+            for cookie in cookie_sigs:
+                if any(c.startswith(cookie) for c in cookies):
                     score += 1.0
-            for pattern in sig.get("body", []):
-                if re.search(pattern, features["body"], re.IGNORECASE):
+            for regex in body_sigs:
+                if regex.search(body):
                     score += 1.0
-            if sig.get("ja3") and sig.get("ja3") == features.get("ja3"):
+            if ja3_sig and ja3_sig == features.get("ja3"):
                 score += 2.0  # TLS fingerprints are strong signals
 
-            delay_threshold = sig.get("delay_threshold")
             if delay_threshold and features.get("delay_ratio", 0) > delay_threshold:
                 score += 1.5  # Behavioral delay is a strong signal
 
             # Check for specific HTTP/2 setting fingerprints
-            h2_sig_settings = sig.get("h2_settings", {})
-            h2_features = features.get("h2_features", {})
-            for setting_name, expected_value in h2_sig_settings.items():
-                if h2_features.get(setting_name.lower()) == expected_value:
+            for setting_name, expected_value in h2_sigs:
+                if h2_features.get(setting_name) == expected_value:
                     score += 2.0  # H2 settings are a very strong signal
                     break  # One match is enough to score for H2
 
@@ -209,6 +230,8 @@ class WafDetector:
     def __init__(self, browser_context: BrowserContext, scraper: cloudscraper.CloudScraper):
         self.context = browser_context
         self.scraper = scraper
+        # WAF verdict per host, so repeated checks against one host skip the probes.
+        self._cache: dict[str, str | None] = {}
 
     def _predict_waf(self, features: dict) -> str | None:
         """Compare response/tls features against the WAF signature DB."""
@@ -263,8 +286,30 @@ class WafDetector:
         fingerprinter = H2Fingerprinter(host, port)
         return await fingerprinter.run()
 
+    async def prime_session(self, base_url: str) -> bool:
+        """Sends one benign request and copies the resulting cookies into the browser context.
+
+        Used instead of :meth:`check_waf` when the WAF verdict is already
+        known, so challenge cookies still reach Playwright.
+        """
+        try:
+            await asyncio.to_thread(self.scraper.get, base_url, timeout=15)
+            await self._transfer_cookies_to_browser_context(self.scraper, base_url)
+            return True
+        except Exception as e:
+            print(f"[!] Initial request to {base_url} failed: {e}")
+            return False
+
     async def check_waf(self, base_url: str, report_file: str = "waf_report.json") -> str | None:
-        """Probes the target to identify the WAF using a headless client."""
+        """Probes the target to identify the WAF using a headless client.
+
+        The verdict is cached per host for the lifetime of the detector.
+        Raises ``ConnectionError`` when the baseline request fails, since no
+        verdict (not even "no WAF") can be given then.
+        """
+        host = urlparse(base_url).netloc
+        if host in self._cache:
+            return self._cache[host]
         print("[*] Starting WAF fingerprinting...")
         waf_name = None
 
@@ -275,7 +320,7 @@ class WafDetector:
             await self._transfer_cookies_to_browser_context(self.scraper, base_url)
         except Exception as e:
             print(f"[!] Initial request to {base_url} failed: {e}")
-            return None
+            raise ConnectionError(f"WAF probe of {base_url} failed") from e
         duration_benign = time.monotonic() - start_time_benign
 
         # 2. Malicious probe request
@@ -291,9 +336,7 @@ class WafDetector:
         # 3. Calculate behavioral and protocol features
         delay_ratio = duration_malicious / duration_benign if duration_benign > 0 else 0.0
 
-        parsed_url = urlparse(base_url)
-        host = parsed_url.netloc
-        port = parsed_url.port or 443
+        port = urlparse(base_url).port or 443
         h2_features = await self._analyze_http2_frames(host, port)
 
         # 4. Assemble features and predict
@@ -313,6 +356,7 @@ class WafDetector:
             print(f"[+] WAF Detected: {waf_name} (Delay Ratio: {delay_ratio:.2f})")
         else:
             print("[-] No specific WAF detected.")
+        self._cache[host] = waf_name
 
         # Persist a small JSON report for the orchestrator/GUI layer.
         try:
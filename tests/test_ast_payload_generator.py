@@ -0,0 +1,29 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from sqli_hunter.ast_payload_generator import AstPayloadGenerator, swap_case
+
+
+def test_payloads_keep_their_operands():
+    gen = AstPayloadGenerator("mysql")
+    time_payloads = [sql for sql, _ in gen.generate("TIME_BASED", context="URL", options={"sleep_time": 3})]
+    assert " TRUE AND SLEEP(3)-- " in time_payloads
+    assert " TRUE OR BENCHMARK(3000000, MD5('1'))-- " in time_payloads
+    true_sql, false_sql, family = gen.generate("BOOLEAN_BASED", context="HTML_ATTRIBUTE")[0]
+    assert (true_sql, false_sql, family) == ("' TRUE AND 1 = 1-- ", "' TRUE AND 1 = 2-- ", "LOGICAL_AND")
+
+
+def test_untampered_payloads_are_memoized():
+    gen = AstPayloadGenerator("mysql")
+    first = gen.generate("BOOLEAN_BASED", context="URL")
+    first.clear()
+    again = AstPayloadGenerator("mysql").generate("BOOLEAN_BASED", context="URL")
+    assert len(again) == 4
+    assert again == gen.generate("BOOLEAN_BASED", context="URL")
+
+
+def test_swap_case_only_changes_letter_case():
+    variants = {swap_case("sleep_1(Md5)") for _ in range(200)}
+    assert all(v.lower() == "sleep_1(md5)" for v in variants)
+    assert len(variants) > 1
+    assert swap_case("") == ""
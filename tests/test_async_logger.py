@@ -0,0 +1,19 @@
+import io
+import os
+import sys
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from sqli_hunter.utils import get_async_logger
+
+
+def test_async_logger_writes_to_current_stdout(monkeypatch):
+    out = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", out)
+    logger = get_async_logger("test-async-logger")
+    assert get_async_logger("test-async-logger") is logger
+    assert len(logger.handlers) == 1
+    logger.warning("[!] Target timed out: %s", "http://t/")
+    deadline = time.monotonic() + 2
+    while "http://t/" not in out.getvalue() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert out.getvalue() == "[!] Target timed out: http://t/\n"
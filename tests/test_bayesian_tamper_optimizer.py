@@ -0,0 +1,78 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqli_hunter.bayesian_tamper_optimizer import BayesianTamperOptimizer, TAMPER_CATEGORIES
+
+
+def test_objective_evaluated_once_per_chain():
+    calls = []
+
+    def objective(chain):
+        calls.append(chain)
+        return float(len(chain))
+
+    optimizer = BayesianTamperOptimizer(objective, n_initial_points=5, n_calls=12)
+    none, space2comment, randomcase = (TAMPER_CATEGORIES.index(n) for n in ('none', 'space2comment', 'randomcase'))
+    for params in ([space2comment, none, none], [none, space2comment, none]):
+        assert optimizer._objective_wrapper(params) == 1.0
+    assert optimizer._objective_wrapper([none, randomcase, space2comment]) == 2.0
+    assert optimizer._objective_wrapper([space2comment, randomcase, none]) == 2.0
+    assert calls == [('space2comment',), ('randomcase', 'space2comment'), ('space2comment', 'randomcase')]
+
+
+def test_warm_start_reuses_prior_scores(tmp_path):
+    path = str(tmp_path / "tamper_prior.json")
+    first_calls, second_calls = [], []
+
+    def objective(calls):
+        def score(chain):
+            calls.append(chain)
+            return -1.0 if chain == ('space2comment', 'randomcase') else float(len(chain))
+        return score
+
+    BayesianTamperOptimizer(objective(first_calls), n_initial_points=3, n_calls=6, n_jobs=1,
+                            warm_start_path=path).optimize()
+    BayesianTamperOptimizer(objective(second_calls), n_initial_points=3, n_calls=6, n_jobs=1,
+                            warm_start_path=path).optimize()
+
+    assert first_calls
+    assert not set(first_calls) & set(second_calls)
+
+
+def test_concurrent_duplicate_chains_share_one_evaluation():
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    calls = []
+    started, release = threading.Event(), threading.Event()
+
+    def objective(chain):
+        calls.append(chain)
+        started.set()
+        release.wait(5)
+        return 1.0
+
+    optimizer = BayesianTamperOptimizer(objective, n_initial_points=5, n_calls=12, n_jobs=2)
+    none, space2comment = (TAMPER_CATEGORIES.index(n) for n in ('none', 'space2comment'))
+    with ThreadPoolExecutor(2) as pool:
+        first = pool.submit(optimizer._objective_wrapper, [space2comment, none, none])
+        started.wait(5)
+        second = pool.submit(optimizer._objective_wrapper, [none, space2comment, none])
+        release.set()
+        assert first.result() == second.result() == 1.0
+    assert calls == [('space2comment',)]
+
+
+def test_warm_start_skips_malformed_entries_and_unwritable_paths(tmp_path):
+    import json
+    path = tmp_path / "tamper_prior.json"
+    path.write_text(json.dumps([
+        [["space2comment"], 0.5], ["randomcase", 1.0], [["urlencode"], "high"], [["unknown"], 0.1], 7,
+    ]))
+    optimizer = BayesianTamperOptimizer(lambda chain: 0.0, n_initial_points=3, n_calls=6, warm_start_path=str(path))
+    assert [score for _, score in optimizer._load_prior()] == [0.5]
+
+    optimizer.warm_start_path = str(tmp_path / "missing" / "prior.json")
+    optimizer._save_prior()
+    assert not (tmp_path / "missing").exists()
@@ -0,0 +1,23 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqli_hunter.utils import BloomFilter
+
+
+def test_bloom_filter_membership():
+    bloom = BloomFilter(capacity=100, error_rate=0.01)
+    assert bloom.add("http://example.com/?id")
+    assert not bloom.add("http://example.com/?id")
+    assert "http://example.com/?id" in bloom
+    assert "http://example.com/?q" not in bloom
+
+
+def test_bloom_filter_grows_past_capacity():
+    bloom = BloomFilter(capacity=100, error_rate=0.01)
+    keys = [f"key-{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other-{i}" in bloom for i in range(1000))
+    assert false_positives < 50
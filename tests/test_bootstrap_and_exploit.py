@@ -4,6 +4,7 @@ import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from sqli_hunter import bootstrap
 from sqli_hunter.bootstrap import load_config
 from sqli_hunter.exploiter import Exploiter
 
@@ -13,6 +14,31 @@ def test_load_config_waf():
     assert "F5 ASM" in sigs
 
 
+def test_yaml_config_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(bootstrap, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(bootstrap, "_loaded_configs", {})
+    source = tmp_path / "sample.yaml"
+    source.write_text("rules:\n  - a\n  - b\n")
+
+    assert load_config("sample") == {"rules": ["a", "b"]}
+    assert (tmp_path / ".cache" / "sample.yaml.pkl").exists()
+
+    # A changed source invalidates the cache.
+    source.write_text("rules: [c]\n")
+    bootstrap._loaded_configs.clear()
+    assert load_config("sample") == {"rules": ["c"]}
+
+
+def test_validate_waf_fingerprints_rejects_bad_types():
+    bootstrap.validate_waf_fingerprints({"Test": {"headers": {}, "cookies": [], "body": []}})
+    for bad in ([], {"Test": []}, {"Test": {"headers": []}}, {"Test": {"body": "x"}}):
+        try:
+            bootstrap.validate_waf_fingerprints(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {bad!r}")
+
+
 def test_side_channel_encoding():
     e = Exploiter(types.SimpleNamespace())
     encoded = e._encode_side_channel_data("secret")
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from sqli_hunter.context_pool import ContextPool
+
+
+class FakePage:
+    def __init__(self):
+        self._handlers = []
+
+    def on(self, event, handler):
+        self._handlers.append(handler)
+
+    async def close(self):
+        for handler in self._handlers:
+            handler(self)
+
+
+class FakeContext:
+    def __init__(self, storage_state=None):
+        self.storage = storage_state or {"cookies": []}
+        self.closed = False
+        self.routes = []
+        self.listeners = []
+
+    def on(self, event, handler):
+        self.listeners.append((event, handler))
+
+    def remove_listener(self, event, handler):
+        self.listeners.remove((event, handler))
+
+    async def route(self, url, handler):
+        self.routes.append((url, handler))
+
+    async def new_page(self):
+        return FakePage()
+
+    async def add_cookies(self, cookies):
+        self.storage["cookies"].extend(cookies)
+
+    async def storage_state(self):
+        return {"cookies": list(self.storage["cookies"])}
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    async def new_context(self, storage_state=None, **options):
+        context = FakeContext(storage_state)
+        self.contexts.append(context)
+        return context
+
+
+def test_context_pool_rotates_and_keeps_storage_state():
+    async def run():
+        browser = FakeBrowser()
+        pool = await ContextPool(browser, rotate_after=2).start()
+        await pool.add_cookies([{"name": "session", "value": "1"}])
+        await pool.route("**/*", print)
+        pool.on("request", repr)
+        first = await pool.new_page()
+        await (await pool.new_page()).close()
+        # The third page triggers a rotation; the first context still has an open page.
+        await pool.new_page()
+        assert len(browser.contexts) == 2
+        assert not browser.contexts[0].closed
+        assert browser.contexts[1].storage["cookies"] == [{"name": "session", "value": "1"}]
+        assert browser.contexts[1].routes == [("**/*", print)]
+        assert browser.contexts[1].listeners == [("request", repr)]
+        pool.remove_listener("request", repr)
+        assert browser.contexts[0].listeners == browser.contexts[1].listeners == []
+        await first.close()
+        await asyncio.sleep(0)
+        assert browser.contexts[0].closed
+        assert not browser.contexts[1].closed
+
+    asyncio.run(run())
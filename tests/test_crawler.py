@@ -0,0 +1,88 @@
+import asyncio
+import os
+import sys
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqli_hunter.crawler import Crawler
+
+
+def test_link_scope_is_the_crawled_host():
+    crawler = Crawler("https://example.com/start", 1, asyncio.Queue(), None)
+    assert crawler._in_scope("https://example.com")
+    assert crawler._in_scope("http://example.com/a?b=1")
+    assert crawler._in_scope("https://EXAMPLE.com/a")
+    assert not crawler._in_scope("https://example.com.evil.net/")
+    assert not crawler._in_scope("https://share.test/?u=https://example.com/")
+    assert not crawler._in_scope("mailto:admin@example.com")
+
+
+def test_start_crawls_pages_concurrently():
+    site = {
+        "https://example.com/": ["https://example.com/a", "https://example.com/b"],
+        "https://example.com/a": ["https://example.com/b", "https://example.com/c"],
+        "https://example.com/b": [],
+        "https://example.com/c": [],
+    }
+    crawled, active, peak = [], 0, 0
+
+    async def crawl_page(url):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        crawled.append(url)
+        return site[url]
+
+    context = MagicMock()
+    crawler = Crawler("https://example.com/", 3, asyncio.Queue(), context, workers=2)
+    crawler.crawl_page = crawl_page
+    asyncio.run(crawler.start())
+
+    assert sorted(crawled) == sorted(site)
+    assert peak == 2
+    context.on.assert_called_once_with('request', crawler._handle_request)
+    context.remove_listener.assert_called_once_with('request', crawler._handle_request)
+
+
+def test_canonical_url_merges_equivalent_spellings():
+    from sqli_hunter.crawler import _canonical_url
+    assert _canonical_url("HTTPS://Example.com/p?b=2&a=1#top") == _canonical_url("https://example.com/p?a=1&b=2")
+    assert _canonical_url("https://example.com/p?a=2&a=1") == "https://example.com/p?a=2&a=1"
+
+
+def test_api_discovery_ignores_pages_the_crawler_did_not_open():
+    crawler = Crawler("https://example.com/", 1, asyncio.Queue(), MagicMock())
+    ours, theirs = MagicMock(), MagicMock()
+    crawler._pages.add(ours)
+
+    def request(page):
+        req = MagicMock(url="https://example.com/api/items", method="GET", resource_type="fetch", post_data=None, headers={})
+        req.frame.page = page
+        return req
+
+    asyncio.run(crawler._handle_request(request(theirs)))
+    assert crawler.scan_queue.empty()
+    asyncio.run(crawler._handle_request(request(ours)))
+    assert crawler.scan_queue.get_nowait()["url"] == "https://example.com/api/items"
+
+
+def test_crawl_dedups_on_canonical_url_but_keeps_original_spelling():
+    base = "http://Example.com/?b=1&a=2"
+    site = {
+        base: ["http://example.com/?a=2&b=1", "http://example.com/x?b=1&a=2"],
+        "http://example.com/x?b=1&a=2": [base],
+    }
+    crawled = []
+
+    async def crawl_page(url):
+        crawled.append(url)
+        return site[url]
+
+    crawler = Crawler(base, 3, asyncio.Queue(), MagicMock())
+    crawler.crawl_page = crawl_page
+    asyncio.run(crawler.start())
+
+    assert crawled == [base, "http://example.com/x?b=1&a=2"]
@@ -18,3 +18,89 @@ def test_orchestrator_collects_metrics(tmp_path):
     assert metrics == [{"v": 1}]
     data = json.loads(report.read_text())
     assert data == [{"v": 1}]
+    log = tmp_path / "report.json.jsonl"
+    assert [json.loads(line) for line in log.read_text().splitlines()] == [{"v": 1}]
+
+
+def test_orchestrator_cancels_agents_after_timeout(tmp_path):
+    report = tmp_path / "report.json"
+
+    async def slow_agent(o: DistributedOrchestrator):
+        await o.send_metric({"v": 1})
+        await asyncio.sleep(10)
+
+    orchestrator = DistributedOrchestrator(report_file=str(report))
+    metrics = asyncio.run(orchestrator.run([slow_agent], timeout=0.1))
+    assert metrics == [{"v": 1}]
+
+
+def test_orchestrator_publisher_is_opt_in(tmp_path):
+    first = DistributedOrchestrator(report_file=str(tmp_path / "a.json"))
+    second = DistributedOrchestrator(report_file=str(tmp_path / "b.json"))
+    assert first.pub_socket is None and second.pub_socket is None
+    endpoint = first.enable_pub()
+    assert endpoint.startswith("tcp://127.0.0.1:")
+    assert second.enable_pub() != endpoint
+    first.pub_socket.close()
+    second.pub_socket.close()
+
+
+def test_subscriber_count_returns_to_zero_when_clients_leave(tmp_path):
+    import zmq
+
+    async def scenario():
+        orchestrator = DistributedOrchestrator(report_file=str(tmp_path / "r.json"))
+        endpoint = orchestrator.enable_pub()
+        watcher = asyncio.create_task(orchestrator._watch_subscriptions())
+        clients = []
+        for _ in range(2):
+            sub = orchestrator._ctx.socket(zmq.SUB)
+            sub.connect(endpoint)
+            sub.setsockopt(zmq.SUBSCRIBE, b"")
+            clients.append(sub)
+
+        async def settle(expected):
+            for _ in range(100):
+                if orchestrator._subscribers == expected:
+                    return
+                await asyncio.sleep(0.01)
+
+        await settle(2)
+        assert orchestrator._subscribers == 2
+        for sub in clients:
+            sub.close(linger=0)
+        await settle(0)
+        watcher.cancel()
+        orchestrator.pub_socket.close()
+        return orchestrator._subscribers
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_failed_batch_send_does_not_hang_shutdown(tmp_path):
+    import zmq
+    from unittest.mock import AsyncMock
+
+    async def agent(o: DistributedOrchestrator):
+        await o.send_metric({"v": 1})
+
+    orchestrator = DistributedOrchestrator(report_file=str(tmp_path / "r.json"))
+    orchestrator._push.send_multipart = AsyncMock(side_effect=zmq.ZMQError())
+    metrics = asyncio.run(asyncio.wait_for(orchestrator.run([agent]), 5))
+    assert metrics == []
+
+
+def test_agent_exception_propagates_after_shutdown(tmp_path):
+    import pytest
+    report = tmp_path / "report.json"
+
+    async def good(o: DistributedOrchestrator):
+        await o.send_metric({"v": 1})
+
+    async def bad(o: DistributedOrchestrator):
+        raise RuntimeError("agent failed")
+
+    orchestrator = DistributedOrchestrator(report_file=str(report))
+    with pytest.raises(RuntimeError, match="agent failed"):
+        asyncio.run(orchestrator.run([good, bad]))
+    assert json.loads(report.read_text()) == [{"v": 1}]
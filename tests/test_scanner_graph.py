@@ -11,3 +11,29 @@ def test_graph_transformer_score():
     ast = sqlglot.parse_one("SELECT 1 UNION SELECT 2")
     score = scanner.graph_scorer.score(ast)
     assert 0.0 <= score <= 1.0
+
+
+def test_record_vulnerability_deduplicates_by_signature():
+    scanner = Scanner(None, types.SimpleNamespace(), {}, None, debug=False)
+    reported = []
+    scanner.on_vulnerability = reported.append
+    first = {"url": "http://t/a?id=1", "parameter": "id", "type": "Boolean-Based (AST)", "payload": "x"}
+    again = {"url": "http://t/a?id=1", "parameter": "id", "type": "Boolean-Based (diff)", "payload": "y"}
+    other = {"url": "http://t/a?id=1", "parameter": "id", "type": "Time-Based", "payload": "z"}
+    assert scanner.record_vulnerability(first)
+    assert not scanner.record_vulnerability(again)
+    assert scanner.record_vulnerability(other)
+    assert list(scanner.vulnerable_points.values()) == [first, other]
+    assert reported == [first, other]
+    assert "type_general" not in first
+
+
+def test_record_vulnerability_keeps_one_finding_per_type_per_parameter():
+    scanner = Scanner(None, types.SimpleNamespace(), {}, None, debug=False)
+    url = "http://t/a?id=1"
+    for vuln_type in ("Error-Based", "Error-Based (MySQL)", "Time-Based", "Boolean-Based (AST)"):
+        scanner.record_vulnerability({"url": url, "parameter": "id", "type": vuln_type, "payload": "x"})
+    scanner.record_vulnerability({"url": url, "parameter": "q", "type": "Time-Based", "payload": "x"})
+    assert sorted(scanner.vulnerable_points) == [
+        (url, "id", "Boolean-Based"), (url, "id", "Error-Based"), (url, "id", "Time-Based"), (url, "q", "Time-Based"),
+    ]
@@ -1,5 +1,6 @@
 import os
 import sys
+import pytest
 from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -71,3 +72,29 @@ def test_single_match_not_enough():
         "delay_ratio": 1.0
     }
     assert detector()._predict_waf(features) is None
+
+def test_check_waf_caches_verdict_per_host(tmp_path):
+    import asyncio
+    from unittest.mock import AsyncMock
+    waf = detector()
+    waf.context.add_cookies = AsyncMock()
+    waf.scraper.cookies = []
+    waf.scraper.get.return_value = MagicMock(headers={}, text="")
+    report = str(tmp_path / "waf.json")
+    async def run():
+        await waf.check_waf("http://example.test/", report_file=report)
+        await waf.check_waf("http://example.test/other", report_file=report)
+        await waf.check_waf("http://other.test/", report_file=report)
+    with patch.object(WafDetector, "_analyze_http2_frames", AsyncMock(return_value={})):
+        asyncio.run(run())
+    # Two probes (benign + malicious) per distinct host.
+    assert waf.scraper.get.call_count == 4
+
+def test_check_waf_failed_probe_is_not_a_verdict(tmp_path):
+    import asyncio
+    waf = detector()
+    waf.scraper.get.side_effect = OSError("timed out")
+    report = str(tmp_path / "waf.json")
+    with pytest.raises(ConnectionError):
+        asyncio.run(waf.check_waf("http://example.test/", report_file=report))
+    assert "example.test" not in waf._cache